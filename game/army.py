@@ -4,10 +4,28 @@ Handles army units, their properties and states
 """
 
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Optional, Sequence
+import numpy as np
 
 
-@dataclass
+# Lookup tables indexed by strength, from 0 to the maximum starting size of 100
+_MAX_LUT_STRENGTH = 100
+
+# Movement tier for every strength: smaller armies are faster
+_TIER_LUT = np.array([4] * 26 + [3] * 25 + [2] * 25 + [1] * 25, dtype=np.int8)
+_TIER_BY_STRENGTH = tuple(_TIER_LUT.tolist())
+
+# Combat power for every strength, without (column 0) and with (column 1) a general
+_CP_LUT = np.arange(_MAX_LUT_STRENGTH + 1)[:, None] * np.array([1.0, 1.25])
+_COMBAT_POWER = tuple(tuple(column) for column in _CP_LUT.T.tolist())
+
+# Bits of Army.flags; the turn bits are cleared together at end of turn
+MOVED = 1
+FOUGHT = 2
+TURN_MASK = MOVED | FOUGHT
+
+
+@dataclass(slots=True)
 class Army:
     """Represents an army unit in the game"""
     
@@ -18,9 +36,12 @@ class Army:
     has_general: bool  # Whether this army has a general
     player_id: int  # ID of the player who controls this army
     
-    # State flags for turn management
-    moved_this_turn: bool = field(default=False)
-    fought_this_turn: bool = field(default=False)
+    # State flags for turn management (MOVED / FOUGHT bits)
+    flags: int = field(default=0)
+    
+    # Flat board key and index of this army in that position's stack (-1 when off the board)
+    _pos_key: int = field(default=-1, init=False, repr=False, compare=False)
+    _stack_index: int = field(default=-1, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Validate initialization data"""
@@ -30,22 +51,36 @@ class Army:
         # Ensure food is non-negative
         self.food = max(0, self.food)
         
+    @property
+    def moved_this_turn(self) -> bool:
+        """Whether this army has moved this turn"""
+        return bool(self.flags & MOVED)
+        
+    @moved_this_turn.setter
+    def moved_this_turn(self, value: bool):
+        self.flags = self.flags | MOVED if value else self.flags & ~MOVED
+        
+    @property
+    def fought_this_turn(self) -> bool:
+        """Whether this army has fought this turn"""
+        return bool(self.flags & FOUGHT)
+        
+    @fought_this_turn.setter
+    def fought_this_turn(self, value: bool):
+        self.flags = self.flags | FOUGHT if value else self.flags & ~FOUGHT
+        
     def get_movement_tier(self) -> int:
-        """Get movement tier based on army size"""
-        if self.strength <= 25:
-            return 4  # Fastest
-        elif self.strength <= 50:
-            return 3
-        elif self.strength <= 75:
-            return 2
-        else:
-            return 1  # Slowest
+        """Get movement tier based on army size (4 is fastest, 1 slowest)"""
+        return _TIER_BY_STRENGTH[min(max(self.strength, 0), _MAX_LUT_STRENGTH)]
     
     def calculate_combat_power(self) -> float:
         """Calculate the combat power of this army, accounting for general"""
-        base_power = self.strength
+        if 0 <= self.strength <= _MAX_LUT_STRENGTH:
+            return _COMBAT_POWER[self.has_general][self.strength]
+            
+        # Merged armies can grow past the table
         general_bonus = 1.25 if self.has_general else 1.0
-        return base_power * general_bonus
+        return self.strength * general_bonus
         
     def can_split(self) -> bool:
         """Check if this army can be split"""
@@ -57,3 +92,53 @@ class Army:
         
     def __repr__(self) -> str:
         return self.__str__()
+
+
+class ArmyPool:
+    """
+    Column-oriented (structure of arrays) snapshot of a group of armies
+    
+    Army objects stay the source of truth for game logic; a pool is built
+    when many armies need the same calculation, so it runs as one NumPy
+    operation instead of a Python loop. Call write_back() to copy
+    strength/food changes made in the pool back onto the armies.
+    """
+    
+    def __init__(self, armies: Sequence[Army]):
+        self.armies = list(armies)
+        count = len(self.armies)
+        # Narrow columns: coordinates and strength fit int16 (merged armies can
+        # pass 127), food gets int32 headroom since it accumulates over a game
+        self.xs = np.fromiter((a.x for a in self.armies), dtype=np.int16, count=count)
+        self.ys = np.fromiter((a.y for a in self.armies), dtype=np.int16, count=count)
+        self.strength = np.fromiter((a.strength for a in self.armies), dtype=np.int16, count=count)
+        self.food = np.fromiter((a.food for a in self.armies), dtype=np.int32, count=count)
+        self.has_general = np.fromiter((a.has_general for a in self.armies), dtype=bool, count=count)
+        self.player_id = np.fromiter((a.player_id for a in self.armies), dtype=np.int8, count=count)
+        
+    def __len__(self) -> int:
+        return len(self.armies)
+        
+    def combat_power(self) -> np.ndarray:
+        """Combat power of every army (see Army.calculate_combat_power)"""
+        return self.strength.astype(np.float32) * np.where(self.has_general, np.float32(1.25), np.float32(1.0))
+        
+    def movement_tiers(self) -> np.ndarray:
+        """Movement tier of every army (see Army.get_movement_tier)"""
+        return _TIER_LUT[np.clip(self.strength, 0, _MAX_LUT_STRENGTH)]
+        
+    def decay_food(self, consumption):
+        """
+        Consume food (a scalar or per-army array); armies that run out lose
+        strength for the shortfall, as in end-of-turn processing
+        """
+        self.food -= consumption
+        starving = self.food <= 0
+        self.strength[starving] -= np.minimum(1 - self.food[starving], self.strength[starving])
+        self.food[starving] = 0
+        
+    def write_back(self):
+        """Copy pool strength and food back onto the army objects"""
+        for army, strength, food in zip(self.armies, self.strength.tolist(), self.food.tolist()):
+            army.strength = strength
+            army.food = food
@@ -3,11 +3,18 @@ Board management for Strategic Conquest
 Handles the game board, tiles, and unit positions
 """
 
+from collections import defaultdict
 from enum import Enum, auto
+from functools import lru_cache
 from typing import List, Dict, Optional, Set, Tuple
-import random
+import hashlib
+import math
+import os
 import numpy as np
 
+from game.army import ArmyPool
+from utils.jit import njit
+
 
 class TileType(Enum):
     """Types of tiles on the board"""
@@ -28,14 +35,63 @@ class TileType(Enum):
         return cls.PLAIN
 
 
+# Integer tile codes, as stored in Board.type_grid. Hot loops and kernels
+# compare these directly; TileType stays the public API.
+PLAIN = TileType.PLAIN.value
+HQ = TileType.HEADQUARTERS.value
+FORT = TileType.FORT.value
+FOREST = TileType.FOREST.value
+VALLEY = TileType.VALLEY.value
+RIVER = TileType.RIVER.value
+MOUNTAIN = TileType.MOUNTAIN.value
+
+# Tiles that generated terrain never overwrites, as a bitmask over codes
+BLOCKED_MASK = 1 << HQ | 1 << FORT
+
+# Where generated maps are cached, keyed by their generation parameters and seed
+MAP_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'fractionalgo', 'maps')
+
+# Bump whenever generation changes what a given seed produces, so stale
+# cached maps are not reused
+_MAP_GENERATOR_VERSION = 3
+
+# Tile types indexed by their integer code, as stored in Board.type_grid
+_TILE_TYPE_BY_CODE = [None] * (max(t.value for t in TileType) + 1)
+for _tile_type in TileType:
+    _TILE_TYPE_BY_CODE[_tile_type.value] = _tile_type
+
+# Cost of moving onto a tile, indexed by tile code
+MOVE_COST_LUT = np.ones(len(_TILE_TYPE_BY_CODE), dtype=np.float32)
+MOVE_COST_LUT[[FOREST, RIVER, MOUNTAIN]] = 2.0
+
+
 class Tile:
-    """Represents a single tile on the board"""
+    """View of a single tile, backed by the board's tile arrays"""
+    
+    __slots__ = ('board', 'x', 'y')
     
-    def __init__(self, x: int, y: int, tile_type: TileType = TileType.PLAIN):
+    def __init__(self, board: 'Board', x: int, y: int):
+        self.board = board
         self.x = x
         self.y = y
-        self.type = tile_type
-        self.player_id: Optional[int] = None  # For headquarters ownership
+        
+    @property
+    def type(self) -> TileType:
+        return _TILE_TYPE_BY_CODE[self.board._tile_type(self.x, self.y)]
+        
+    @type.setter
+    def type(self, tile_type: TileType):
+        self.board._set_tile_type(self.x, self.y, tile_type.value)
+        
+    @property
+    def player_id(self) -> Optional[int]:
+        """Owner of the tile (for headquarters ownership)"""
+        owner = self.board.owner_grid[self.y, self.x]
+        return None if owner < 0 else int(owner)
+        
+    @player_id.setter
+    def player_id(self, player_id: Optional[int]):
+        self.board.owner_grid[self.y, self.x] = -1 if player_id is None else player_id
         
     def __str__(self):
         return f"Tile({self.x}, {self.y}, {self.type.name})"
@@ -47,20 +103,116 @@ class Board:
     def __init__(self, width: int, height: int):
         self.width = width
         self.height = height
-        self.tiles: List[List[Tile]] = []
-        self.armies_by_position: Dict[Tuple[int, int], List['Army']] = {}
+        self.type_grid = np.full((height, width), PLAIN, dtype=np.int8)
+        self.owner_grid = np.full((height, width), -1, dtype=np.int8)
+        # Armies keyed by flat position (y * width + x)
+        self.armies_by_position: Dict[int, List['Army']] = defaultdict(list)
+        # Set when armies are placed or moved, so combat is only checked then
+        self.combat_dirty = False
+        # Bumped on every change to the armies on the board, so callers can
+        # tell whether anything they cached from it is stale
+        self.revision = 0
+        # Bumped whenever tile types change, for caches built from the terrain
+        self.terrain_revision = 0
+        # Per-tile army totals and the revision they were built at
+        self._army_totals: Dict[int, Dict[int, Tuple[int, bool]]] = {}
+        self._army_totals_revision = -1
         
         # Initialize empty board
         self._initialize_board()
+        self._build_adjacency()
         
     def _initialize_board(self):
         """Initialize the board with plain tiles"""
-        self.tiles = []
+        self.type_grid.fill(PLAIN)
+        self.owner_grid.fill(-1)
+        self._terrain_changed()
+        
+    def _build_adjacency(self):
+        """Precompute the orthogonal neighbours of every tile"""
+        # CSR layout over flat indices (y * width + x): the neighbours of tile i
+        # are _nbr_idx[_nbr_indptr[i]:_nbr_indptr[i + 1]]
+        indptr = [0]
+        indices = []
+        self._adjacent_positions: List[Tuple[Tuple[int, int], ...]] = []
+        self._adjacent_keys: List[Tuple[int, ...]] = []
         for y in range(self.height):
-            row = []
             for x in range(self.width):
-                row.append(Tile(x, y, TileType.PLAIN))
-            self.tiles.append(row)
+                adjacent = tuple(
+                    (adj_x, adj_y) for adj_x, adj_y in ((x-1, y), (x+1, y), (x, y-1), (x, y+1))
+                    if 0 <= adj_x < self.width and 0 <= adj_y < self.height
+                )
+                keys = tuple(adj_y * self.width + adj_x for adj_x, adj_y in adjacent)
+                self._adjacent_positions.append(adjacent)
+                self._adjacent_keys.append(keys)
+                indices.extend(keys)
+                indptr.append(len(indices))
+                
+        self._nbr_indptr = np.array(indptr, dtype=np.int32)
+        self._nbr_idx = np.array(indices, dtype=np.int32)
+        
+    def _terrain_changed(self):
+        """Drop everything derived from type_grid after tiles change"""
+        self._move_cost = None
+        self._fort_positions = None
+        self.terrain_revision += 1
+        
+    @property
+    def fort_positions(self) -> List[Tuple[int, int]]:
+        """Positions of every fort on the board"""
+        if self._fort_positions is None:
+            ys, xs = np.nonzero(self.type_grid == FORT)
+            self._fort_positions = list(zip(xs.tolist(), ys.tolist()))
+        return self._fort_positions
+        
+    @property
+    def army_totals(self) -> Dict[int, Dict[int, Tuple[int, bool]]]:
+        """
+        Combined (strength, has_general) of each player's armies on every
+        occupied tile, keyed by flat position and then player id
+        
+        Rebuilt only when revision changes, so code that changes an army's
+        strength or general in place must bump revision
+        """
+        if self._army_totals_revision != self.revision:
+            totals = {}
+            for key, armies in self.armies_by_position.items():
+                by_player = {}
+                for army in armies:
+                    total = by_player.get(army.player_id)
+                    if total is None:
+                        by_player[army.player_id] = (army.strength, army.has_general)
+                    else:
+                        by_player[army.player_id] = (total[0] + army.strength, total[1] or army.has_general)
+                if by_player:
+                    totals[key] = by_player
+            self._army_totals = totals
+            self._army_totals_revision = self.revision
+        return self._army_totals
+        
+    @property
+    def move_cost(self) -> np.ndarray:
+        """Cost of moving onto each tile, flat by y * width + x"""
+        if self._move_cost is None:
+            self._build_move_cost()
+        return self._move_cost
+        
+    def _build_move_cost(self):
+        """Look up tile costs, plus the cost of each CSR edge in neighbour order"""
+        self._move_cost = MOVE_COST_LUT[self.type_grid.ravel()]
+        self._nbr_cost = self._move_cost[self._nbr_idx]
+        
+    def neighbors_and_costs(self, u: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Flat indices of the neighbours of tile u and the cost of moving onto each, as views"""
+        if self._move_cost is None:
+            self._build_move_cost()
+        start, end = self._nbr_indptr[u], self._nbr_indptr[u + 1]
+        return self._nbr_idx[start:end], self._nbr_cost[start:end]
+        
+    @property
+    def tiles(self) -> List[List[Tile]]:
+        """Rows of tile views (materialized on demand)"""
+        return [[Tile(self, x, y) for x in range(self.width)] for y in range(self.height)]
             
     def is_valid_position(self, x: int, y: int) -> bool:
         """Check if a position is valid on the board"""
@@ -70,230 +222,471 @@ class Board:
         """Get the tile at a specific position"""
         if not self.is_valid_position(x, y):
             raise ValueError(f"Invalid position: ({x}, {y})")
-        return self.tiles[y][x]
+        return Tile(self, x, y)
         
     def set_tile_type(self, x: int, y: int, tile_type: TileType):
         """Set the type of a tile at a specific position"""
         if not self.is_valid_position(x, y):
             raise ValueError(f"Invalid position: ({x}, {y})")
-        self.tiles[y][x].type = tile_type
+        self.type_grid[y, x] = tile_type.value
+        self._terrain_changed()
+        
+    def _tile_type(self, x: int, y: int) -> int:
+        """Tile code at a position the caller knows is on the board"""
+        return int(self.type_grid[y, x])
+        
+    def _set_tile_type(self, x: int, y: int, code: int):
+        """Set the tile code at a position the caller knows is on the board"""
+        self.type_grid[y, x] = code
+        self._terrain_changed()
         
     def add_army(self, army: 'Army'):
         """Add an army to the board"""
-        pos = (army.x, army.y)
-        if pos not in self.armies_by_position:
-            self.armies_by_position[pos] = []
-        self.armies_by_position[pos].append(army)
+        key = army.y * self.width + army.x
+        stack = self.armies_by_position[key]
+        army._pos_key = key
+        army._stack_index = len(stack)
+        stack.append(army)
+        self.combat_dirty = True
+        self.revision += 1
+        
+    def _remove_from_stack(self, pos: int, army: 'Army'):
+        """Remove an army from the stack at a flat position by swapping with the last"""
+        stack = self.armies_by_position.get(pos)
+        index = army._stack_index
+        if not stack or not 0 <= index < len(stack) or stack[index] is not army:
+            return
+            
+        last = stack.pop()
+        if last is not army:
+            stack[index] = last
+            last._stack_index = index
+        army._stack_index = -1
+        army._pos_key = -1
+        self.revision += 1
+        
+        if not stack:
+            del self.armies_by_position[pos]
         
     def remove_army(self, army: 'Army'):
         """Remove an army from the board"""
-        pos = (army.x, army.y)
-        if pos in self.armies_by_position and army in self.armies_by_position[pos]:
-            self.armies_by_position[pos].remove(army)
-            if not self.armies_by_position[pos]:
-                del self.armies_by_position[pos]
-                
-    def move_army(self, army: 'Army', old_x: int, old_y: int, new_x: int, new_y: int):
-        """Update army position on the board"""
-        old_pos = (old_x, old_y)
-        new_pos = (new_x, new_y)
-        
-        # Remove from old position
-        if old_pos in self.armies_by_position and army in self.armies_by_position[old_pos]:
-            self.armies_by_position[old_pos].remove(army)
-            if not self.armies_by_position[old_pos]:
-                del self.armies_by_position[old_pos]
+        key = army._pos_key
+        self._remove_from_stack(key if key >= 0 else army.y * self.width + army.x, army)
                 
-        # Add to new position
-        if new_pos not in self.armies_by_position:
-            self.armies_by_position[new_pos] = []
-        self.armies_by_position[new_pos].append(army)
+    def remove_armies(self, armies: List['Army']):
+        """Remove several armies from the board"""
+        width = self.width
+        remove = self._remove_from_stack
+        for army in armies:
+            key = army._pos_key
+            remove(key if key >= 0 else army.y * width + army.x, army)
+            
+    def move_army(self, army: 'Army', new_x: int, new_y: int):
+        """
+        Update army position on the board
+        The old position is read from the army's stored key
+        """
+        key = army._pos_key
+        if key >= 0:
+            self._remove_from_stack(key, army)
+            
+        new_key = new_y * self.width + new_x
+        stack = self.armies_by_position[new_key]
+        army._pos_key = new_key
+        army._stack_index = len(stack)
+        stack.append(army)
+        self.combat_dirty = True
+        self.revision += 1
         
     def get_armies_at(self, x: int, y: int) -> List['Army']:
         """Get all armies at a specific position"""
-        pos = (x, y)
-        return self.armies_by_position.get(pos, [])
+        return self.armies_by_position.get(y * self.width + x, [])
         
-    def get_adjacent_positions(self, x: int, y: int) -> List[Tuple[int, int]]:
+    def army_pool(self) -> ArmyPool:
+        """Snapshot every army on the board into a column-oriented pool"""
+        return ArmyPool([army for armies in self.armies_by_position.values() for army in armies])
+        
+    def get_adjacent_positions(self, x: int, y: int) -> Tuple[Tuple[int, int], ...]:
         """Get all valid adjacent positions (orthoganally connected)"""
-        adjacent = [
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._adjacent_positions[y * self.width + x]
+        adjacent = (
             (x-1, y), (x+1, y), (x, y-1), (x, y+1)
-        ]
-        return [pos for pos in adjacent if self.is_valid_position(pos[0], pos[1])]
+        )
+        return tuple(pos for pos in adjacent if self.is_valid_position(pos[0], pos[1]))
         
     def get_adjacent_armies(self, x: int, y: int) -> List['Army']:
         """Get all armies adjacent to a position"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            armies = []
+            for adj_x, adj_y in self.get_adjacent_positions(x, y):
+                armies.extend(self.get_armies_at(adj_x, adj_y))
+            return armies
+            
+        armies_by_position = self.armies_by_position
+        armies = []
+        for pos in self._adjacent_keys[y * self.width + x]:
+            if pos in armies_by_position:
+                armies.extend(armies_by_position[pos])
+        return armies
+        
+    def get_armies_within(self, x: int, y: int, radius: int) -> List['Army']:
+        """Get all armies within a Manhattan distance of a position (inclusive)"""
+        armies_by_position = self.armies_by_position
         armies = []
-        for adj_x, adj_y in self.get_adjacent_positions(x, y):
-            armies.extend(self.get_armies_at(adj_x, adj_y))
+        
+        # armies_by_position is a spatial hash of occupied tiles: probe the
+        # diamond when it is smaller than the set of occupied tiles, otherwise
+        # filter the occupied tiles by distance
+        if 2 * radius * (radius + 1) + 1 <= len(armies_by_position):
+            for dx, dy in _diamond_offsets(radius):
+                near_x, near_y = x + dx, y + dy
+                if 0 <= near_x < self.width and 0 <= near_y < self.height:
+                    stack = armies_by_position.get(near_y * self.width + near_x)
+                    if stack:
+                        armies.extend(stack)
+        else:
+            for pos, stack in armies_by_position.items():
+                near_y, near_x = divmod(pos, self.width)
+                if abs(near_x - x) + abs(near_y - y) <= radius:
+                    armies.extend(stack)
+                    
         return armies
         
     def generate_random_map(self, fort_count: int = 5, forest_percentage: float = 0.2, 
-                           river_count: int = 2, mountain_percentage: float = 0.1):
-        """Generate a random map layout"""
+                           river_count: int = 2, mountain_percentage: float = 0.1,
+                           terrain: str = 'clumped', seed: Optional[int] = None):
+        """
+        Generate a random map layout
+        
+        terrain selects how forests, mountains and rivers are laid out:
+        'clumped' grows clusters from random seeds and walks rivers across the
+        map, 'noise' thresholds fractal noise fields in a single vectorized pass
+        
+        When a seed is given the map is reproducible, and is cached on disk
+        under MAP_CACHE_DIR so later calls with the same parameters load it
+        instead of generating it again
+        """
+        if terrain not in ('clumped', 'noise'):
+            raise ValueError(f"Unknown terrain style: {terrain}")
+            
+        params = (fort_count, forest_percentage, river_count, mountain_percentage, terrain)
+        if seed is None:
+            self._generate_map(*params, np.random.default_rng())
+            return
+            
+        cache_path = self._map_cache_path(params, seed)
+        if self._load_cached_map(cache_path):
+            return
+            
+        self._generate_map(*params, np.random.default_rng(seed))
+        self._save_cached_map(cache_path)
+        
+    def _generate_map(self, fort_count: int, forest_percentage: float, river_count: int,
+                      mountain_percentage: float, terrain: str, rng: np.random.Generator):
+        """Lay out forts and terrain on a freshly cleared board, drawing from rng"""
         # Reset the board to all plains
         self._initialize_board()
         
         # Place forts (evenly distributed)
-        fort_positions = self._generate_distributed_positions(fort_count)
+        fort_positions = self._generate_distributed_positions(fort_count, rng)
         for x, y in fort_positions:
-            self.set_tile_type(x, y, TileType.FORT)
+            self._set_tile_type(x, y, FORT)
+            
+        if terrain == 'noise':
+            self._generate_noise_terrain(forest_percentage, river_count, mountain_percentage, rng)
+            return
             
         # Add forests (in clumps)
         forest_count = int(self.width * self.height * forest_percentage)
-        self._generate_clumped_terrain(forest_count, TileType.FOREST, clump_factor=0.7)
+        self._generate_clumped_terrain(forest_count, TileType.FOREST, rng, clump_factor=0.7)
             
         # Add mountains (in clumps)
         mountain_count = int(self.width * self.height * mountain_percentage)
-        self._generate_clumped_terrain(mountain_count, TileType.MOUNTAIN, clump_factor=0.6)
+        self._generate_clumped_terrain(mountain_count, TileType.MOUNTAIN, rng, clump_factor=0.6)
             
         # Add rivers
         for _ in range(river_count):
-            self._generate_river()
+            self._generate_river(rng)
             
-    def _generate_distributed_positions(self, count: int) -> List[Tuple[int, int]]:
-        """Generate evenly distributed positions on the map"""
-        positions = []
+    def _map_cache_path(self, params: tuple, seed: int) -> str:
+        """Cache file for a map with the given generation parameters"""
+        key = repr((_MAP_GENERATOR_VERSION, self.width, self.height) + params + (seed,))
+        return os.path.join(MAP_CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + '.npz')
         
-        # Divide the map into regions
-        if count <= 1:
-            regions = [(0, 0, self.width, self.height)]
-        else:
-            # Try to create a grid of regions
-            grid_size = int(np.ceil(np.sqrt(count)))
-            region_width = self.width // grid_size
-            region_height = self.height // grid_size
+    def _load_cached_map(self, path: str) -> bool:
+        """Load a cached map into the board, returning False if unavailable"""
+        try:
+            with np.load(path) as cached:
+                type_grid = cached['type_grid']
+        except (OSError, ValueError, KeyError):
+            return False
             
-            regions = []
-            for i in range(grid_size):
-                for j in range(grid_size):
-                    x_start = i * region_width
-                    y_start = j * region_height
-                    x_end = min((i + 1) * region_width, self.width)
-                    y_end = min((j + 1) * region_height, self.height)
-                    regions.append((x_start, y_start, x_end, y_end))
-                    
-                    if len(regions) >= count:
-                        break
-                if len(regions) >= count:
-                    break
-                    
-        # Place one position in each region
-        for x_start, y_start, x_end, y_end in regions[:count]:
-            # Add some randomness within the region
-            margin = 2  # Stay away from the edges
-            x = random.randint(x_start + margin, x_end - margin - 1) if x_end - x_start > 2*margin else (x_start + x_end) // 2
-            y = random.randint(y_start + margin, y_end - margin - 1) if y_end - y_start > 2*margin else (y_start + y_end) // 2
+        if type_grid.shape != self.type_grid.shape:
+            return False
             
-            positions.append((x, y))
+        self.type_grid[:] = type_grid
+        self.owner_grid.fill(-1)
+        self._terrain_changed()
+        return True
+        
+    def _save_cached_map(self, path: str):
+        """Write the board's terrain to the map cache (best effort)"""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            np.savez_compressed(path, type_grid=self.type_grid)
+        except OSError:
+            pass
             
-        return positions
+    def _generate_distributed_positions(self, count: int, rng: np.random.Generator) -> List[Tuple[int, int]]:
+        """Generate evenly distributed positions on the map"""
+        if count <= 0:
+            return []
+            
+        # Divide the map into a grid of regions, filled column by column,
+        # and place one position in each of the first `count` regions
+        grid_size = math.isqrt(count - 1) + 1
+        region = np.arange(count)
+        region_width = self.width // grid_size
+        region_height = self.height // grid_size
+        x_start = region // grid_size * region_width
+        y_start = region % grid_size * region_height
+        x_end = np.minimum(x_start + region_width, self.width)
+        y_end = np.minimum(y_start + region_height, self.height)
+        
+        # Add some randomness within regions wide enough to keep off their edges
+        margin = 2
+        xs = _jitter_within(x_start, x_end, margin, rng)
+        ys = _jitter_within(y_start, y_end, margin, rng)
         
-    def _generate_clumped_terrain(self, count: int, tile_type: TileType, clump_factor: float = 0.5):
+        return list(zip(xs.tolist(), ys.tolist()))
+        
+    def _generate_clumped_terrain(self, count: int, tile_type: TileType, rng: np.random.Generator,
+                                  clump_factor: float = 0.5):
         """Generate terrain features in clumps"""
         if count <= 0:
             return
             
-        # Start with random seed points
-        seed_count = max(1, int(count * (1 - clump_factor)))
-        positions = set()
+        # Start with random seed points, never on headquarters or forts
+        blocked = _blocked_tiles(self.type_grid).ravel()
+        seed_count = min(max(1, int(count * (1 - clump_factor))), int(np.count_nonzero(~blocked)))
+        seeds = np.empty(0, dtype=np.intp)
         
-        while len(positions) < seed_count:
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
+        while len(seeds) < seed_count:
+            # Rejection-sample a batch of flat indices, keeping them in draw order
+            flat = rng.integers(0, blocked.size, size=seed_count * 2)
+            candidates = np.concatenate((seeds, flat[~blocked[flat]]))
+            _, first_seen = np.unique(candidates, return_index=True)
+            seeds = candidates[np.sort(first_seen)]
             
-            # Don't place on headquarters or forts
-            tile = self.get_tile(x, y)
-            if tile.type not in (TileType.HEADQUARTERS, TileType.FORT):
-                positions.add((x, y))
-                
-        # Grow clusters
-        while len(positions) < count:
-            # Pick a random existing position
-            if not positions:
+        seeds = seeds[:seed_count]
+        placed = np.zeros(blocked.size, dtype=bool)
+        placed[seeds] = True
+        placed = placed.reshape(self.height, self.width)
+        placed_count = len(seeds)
+        
+        # Grow clusters outwards from the placed tiles, never onto HQ/forts or
+        # tiles that already have this terrain
+        excluded = _blocked_tiles(self.type_grid) | (self.type_grid == tile_type.value)
+        frontier = np.empty_like(placed)
+        
+        while placed_count < count:
+            # Orthogonal neighbours of every placed tile (no wrap-around)
+            frontier.fill(False)
+            frontier[1:, :] |= placed[:-1, :]
+            frontier[:-1, :] |= placed[1:, :]
+            frontier[:, 1:] |= placed[:, :-1]
+            frontier[:, :-1] |= placed[:, 1:]
+            frontier &= ~(placed | excluded)
+            
+            candidates = np.flatnonzero(frontier)
+            if not candidates.size:
                 break
                 
-            seed_x, seed_y = random.choice(list(positions))
+            grow_count = min(count - placed_count, candidates.size)
+            placed.ravel()[rng.choice(candidates, grow_count, replace=False)] = True
+            placed_count += grow_count
             
-            # Get adjacent positions
-            adjacent = self.get_adjacent_positions(seed_x, seed_y)
-            valid_adjacent = []
-            
-            for adj_x, adj_y in adjacent:
-                # Check if position is already used or is HQ/fort
-                if (adj_x, adj_y) in positions:
-                    continue
-                    
-                tile = self.get_tile(adj_x, adj_y)
-                if tile.type in (TileType.HEADQUARTERS, TileType.FORT, tile_type):
-                    continue
-                    
-                valid_adjacent.append((adj_x, adj_y))
-                
-            # Add a random adjacent position
-            if valid_adjacent:
-                positions.add(random.choice(valid_adjacent))
-                
         # Set tile types
-        for x, y in positions:
-            self.set_tile_type(x, y, tile_type)
+        self.type_grid[placed] = tile_type.value
             
-    def _generate_river(self):
+    def _generate_noise_terrain(self, forest_percentage: float, river_count: int,
+                                mountain_percentage: float, rng: np.random.Generator):
+        """Generate forests, mountains and rivers from fractal noise fields"""
+        free = np.flatnonzero(~_blocked_tiles(self.type_grid))
+        if not free.size:
+            return
+            
+        size = self.width * self.height
+        types = self.type_grid.ravel()
+        
+        # Mountains take the highest elevations, forests the band just below them
+        elevation = _fractal_noise(self.height, self.width, rng).ravel()
+        by_elevation = free[np.argsort(elevation[free])]
+        mountain_count = min(int(size * mountain_percentage), free.size)
+        forest_count = min(int(size * forest_percentage), free.size - mountain_count)
+        types[by_elevation[free.size - mountain_count - forest_count:free.size - mountain_count]] = FOREST
+        types[by_elevation[free.size - mountain_count:]] = MOUNTAIN
+        
+        # Rivers follow the zero crossings of a second, centred noise field
+        if river_count > 0:
+            ridges = _fractal_noise(self.height, self.width, rng).ravel()
+            ridges = np.abs(ridges - np.median(ridges))
+            river_tile_count = min(river_count * max(self.width, self.height), free.size)
+            types[free[np.argsort(ridges[free])[:river_tile_count]]] = RIVER
+            
+    def _generate_river(self, rng: np.random.Generator):
         """Generate a river across the map"""
-        # Decide direction (horizontal or vertical)
-        is_horizontal = random.choice([True, False])
+        # Decide direction (horizontal or vertical) and which edge to start from
+        is_horizontal, forward = (rng.random(2) < 0.5).tolist()
         
+        # Pick a row (horizontal) or column (vertical) to start in
         if is_horizontal:
-            # Start from left or right
-            start_from_left = random.choice([True, False])
-            
-            # Pick a row
-            y = random.randint(2, self.height - 3)
+            lane = int(rng.integers(2, self.height - 2))
+            length = self.width
+        else:
+            lane = int(rng.integers(2, self.width - 2))
+            length = self.height
             
-            # Generate river path
-            x = 0 if start_from_left else self.width - 1
-            river_tiles = []
+        # Draw the random walk up front: each step drifts one lane with 20% chance
+        change_roll = rng.random(length)
+        change_dir = rng.integers(0, 2, length) * 2 - 1
+        
+        # The lane at each step is the running sum of the earlier drifts
+        drift = np.where(change_roll < 0.2, change_dir, 0)
+        lanes = np.concatenate(([lane], lane + np.cumsum(drift[:-1])))
+        lane_count = self.height if is_horizontal else self.width
+        if lanes.min() < 1 or lanes.max() > lane_count - 2:
+            # Drifts towards the map edge are rejected rather than clipped,
+            # which a cumulative sum cannot express; walk it step by step
+            _river_kernel(self.type_grid, is_horizontal, forward, lane, change_roll, change_dir)
+            return
             
-            while 0 <= x < self.width:
-                river_tiles.append((x, y))
-                
-                # Move forward
-                x = x + 1 if start_from_left else x - 1
-                
-                # Occasionally change y
-                if random.random() < 0.2:
-                    y_change = random.choice([-1, 1])
-                    new_y = y + y_change
-                    
-                    if 1 <= new_y < self.height - 1:
-                        y = new_y
+        along = np.arange(length) if forward else np.arange(length - 1, -1, -1)
+        xs, ys = (along, lanes) if is_horizontal else (lanes, along)
+        keep = ~_blocked_tiles(self.type_grid[ys, xs])
+        self.type_grid[ys[keep], xs[keep]] = RIVER
+
+
+def generate_map_batch(n_maps: int, width: int, height: int, seed: Optional[int] = None,
+                       max_workers: Optional[int] = None, **params) -> np.ndarray:
+    """
+    Generate n_maps independent maps as an (n_maps, height, width) int8 array
+    of tile codes, spread across worker processes
+    
+    params are the generate_random_map keyword arguments (other than seed).
+    Each map draws from its own stream spawned from seed, so a batch is
+    reproducible for a given seed regardless of how many workers run it
+    """
+    params = {'fort_count': 5, 'forest_percentage': 0.2, 'river_count': 2,
+              'mountain_percentage': 0.1, 'terrain': 'clumped', **params}
+    if params['terrain'] not in ('clumped', 'noise'):
+        raise ValueError(f"Unknown terrain style: {params['terrain']}")
+        
+    seeds = np.random.SeedSequence(seed).spawn(n_maps)
+    jobs = [(width, height, params, child) for child in seeds]
+    batch = np.empty((n_maps, height, width), dtype=np.int8)
+    
+    if max_workers == 1 or n_maps <= 1:
+        for i, job in enumerate(jobs):
+            batch[i] = _generate_batch_map(job)
+        return batch
+        
+    from concurrent.futures import ProcessPoolExecutor
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, n_maps // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for i, type_grid in enumerate(executor.map(_generate_batch_map, jobs, chunksize=chunksize)):
+            batch[i] = type_grid
+    return batch
+
+
+def _generate_batch_map(job: tuple) -> np.ndarray:
+    """Generate one map of a batch (top level so worker processes can run it)"""
+    width, height, params, seed_sequence = job
+    board = Board(width, height)
+    board._generate_map(params['fort_count'], params['forest_percentage'], params['river_count'],
+                        params['mountain_percentage'], params['terrain'],
+                        np.random.default_rng(seed_sequence))
+    return board.type_grid
+
+
+@njit(cache=True)
+def _river_kernel(type_grid, is_horizontal, forward, lane, change_roll, change_dir):
+    """Walk a river across type_grid, occasionally drifting one lane sideways"""
+    height, width = type_grid.shape
+    length = width if is_horizontal else height
+    lanes = height if is_horizontal else width
+    
+    for step in range(length):
+        along = step if forward else length - 1 - step
+        if is_horizontal:
+            x, y = along, lane
         else:
-            # Start from top or bottom
-            start_from_top = random.choice([True, False])
+            x, y = lane, along
             
-            # Pick a column
-            x = random.randint(2, self.width - 3)
+        # Rivers never replace headquarters or forts
+        if not (1 << type_grid[y, x]) & BLOCKED_MASK:
+            type_grid[y, x] = RIVER
             
-            # Generate river path
-            y = 0 if start_from_top else self.height - 1
-            river_tiles = []
+        # Occasionally change lane, staying off the map edge
+        if change_roll[step] < 0.2:
+            new_lane = lane + change_dir[step]
+            if 1 <= new_lane < lanes - 1:
+                lane = new_lane
+
+
+@lru_cache(maxsize=None)
+def _diamond_offsets(radius: int) -> Tuple[Tuple[int, int], ...]:
+    """All (dx, dy) offsets within a Manhattan distance, including (0, 0)"""
+    return tuple(
+        (dx, dy)
+        for dx in range(-radius, radius + 1)
+        for dy in range(-(radius - abs(dx)), radius - abs(dx) + 1)
+    )
+
+
+def _jitter_within(start: np.ndarray, end: np.ndarray, margin: int,
+                   rng: np.random.Generator) -> np.ndarray:
+    """Random points in [start + margin, end - margin), or midpoints of narrow spans"""
+    roomy = end - start > 2 * margin
+    low = start + margin
+    high = np.maximum(end - margin, low + 1)
+    return np.where(roomy, rng.integers(low, high), (start + end) // 2)
+
+
+def _blocked_tiles(type_grid: np.ndarray) -> np.ndarray:
+    """Boolean mask of the tiles in BLOCKED_MASK"""
+    return ((1 << type_grid.astype(np.int16)) & BLOCKED_MASK) != 0
+
+
+def _fractal_noise(height: int, width: int, rng: np.random.Generator, octaves: int = 4,
+                   persistence: float = 0.5, base_cells: int = 3) -> np.ndarray:
+    """Sum octaves of smoothed value noise over a (height, width) grid"""
+    noise = np.zeros((height, width))
+    amplitude = 1.0
+    
+    for octave in range(octaves):
+        cells = base_cells * 2 ** octave
+        if octave and cells > max(height, width):
+            break
             
-            while 0 <= y < self.height:
-                river_tiles.append((x, y))
-                
-                # Move forward
-                y = y + 1 if start_from_top else y - 1
-                
-                # Occasionally change x
-                if random.random() < 0.2:
-                    x_change = random.choice([-1, 1])
-                    new_x = x + x_change
-                    
-                    if 1 <= new_x < self.width - 1:
-                        x = new_x
-                        
-        # Set river tiles
-        for rx, ry in river_tiles:
-            tile = self.get_tile(rx, ry)
-            if tile.type not in (TileType.HEADQUARTERS, TileType.FORT):
-                self.set_tile_type(rx, ry, TileType.RIVER)
+        # Random lattice values, interpolated with a smoothstep falloff
+        lattice = rng.random((cells + 1, cells + 1))
+        ys = np.linspace(0, cells, height, endpoint=False)
+        xs = np.linspace(0, cells, width, endpoint=False)
+        y0, x0 = ys.astype(int), xs.astype(int)
+        ty = _smoothstep(ys - y0)[:, None]
+        tx = _smoothstep(xs - x0)[None, :]
+        
+        top = lattice[np.ix_(y0, x0)] * (1 - tx) + lattice[np.ix_(y0, x0 + 1)] * tx
+        bottom = lattice[np.ix_(y0 + 1, x0)] * (1 - tx) + lattice[np.ix_(y0 + 1, x0 + 1)] * tx
+        noise += amplitude * (top * (1 - ty) + bottom * ty)
+        amplitude *= persistence
+        
+    return noise
+
+
+def _smoothstep(t: np.ndarray) -> np.ndarray:
+    """Ease interpolation weights so lattice seams are not visible"""
+    return t * t * (3 - 2 * t)
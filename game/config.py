@@ -0,0 +1,76 @@
+"""
+Configuration loading for Strategic Conquest
+Parses config.yaml once and shares the result
+"""
+
+from functools import lru_cache
+import json
+import os
+
+
+CONFIG_PATH = 'config.yaml'
+
+# Suffix of the JSON copy written next to a parsed config file
+SIDECAR_SUFFIX = '.json'
+
+
+@lru_cache(maxsize=None)
+def load_config(path: str = CONFIG_PATH) -> dict:
+    """
+    Load the game configuration, parsing each file only once per process
+    
+    A JSON copy of the parsed YAML is kept next to it and read instead while
+    it is at least as new as the YAML, since JSON parses much faster
+    
+    The returned dict is shared between callers and must be treated as
+    read-only
+    """
+    sidecar = path + SIDECAR_SUFFIX
+    config = _load_sidecar(path, sidecar)
+    if config is not None:
+        return config
+        
+    config = _parse_yaml(path)
+    _write_sidecar(sidecar, config)
+    return config
+
+
+def _parse_yaml(path: str) -> dict:
+    """Parse a YAML file, with libyaml's C parser when PyYAML was built with it"""
+    # Imported here so runs served from the sidecar never load PyYAML
+    import yaml
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def _load_sidecar(path: str, sidecar: str):
+    """The sidecar's contents if it is up to date with path, otherwise None"""
+    try:
+        if os.stat(sidecar).st_mtime_ns < os.stat(path).st_mtime_ns:
+            return None
+        with open(sidecar, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_sidecar(sidecar: str, config: dict):
+    """
+    Write the sidecar, replacing any old one in a single step
+    
+    Skipped when the config does not survive a JSON round trip unchanged
+    (non-string keys, for example); write failures are ignored
+    """
+    tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+    try:
+        text = json.dumps(config)
+        if json.loads(text) != config:
+            return
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, sidecar)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
@@ -5,4 +5,4 @@ Game package for Strategic Conquest
 # Import main game components for easy access
 from game.state import GameState, Player
 from game.board import Board, Tile, TileType
-from game.army import Army
+from game.army import Army, ArmyPool
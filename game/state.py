@@ -3,18 +3,41 @@ Game state management for Strategic Conquest
 Handles core game logic, turn management, and state transitions
 """
 
+from bisect import bisect_right
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Set, Tuple
-import yaml
 import os
+import numpy as np
 
-from game.board import Board, Tile, TileType
-from game.army import Army
+from game.board import Board, Tile, TileType, HQ, FORT, FOREST, MOUNTAIN
+from game.army import Army, MOVED, FOUGHT, TURN_MASK
+from game.config import load_config
+from utils.jit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True, boundscheck=False)
+def _stamp_visibility(cx, cy, r, width, height, visible):
+    """Mark every on-board tile within Manhattan distance r of (cx, cy) in a flat bitmap"""
+    for dx in range(-r, r + 1):
+        x = cx + dx
+        if x < 0 or x >= width:
+            continue
+        reach = r - abs(dx)
+        for dy in range(-reach, reach + 1):
+            y = cy + dy
+            if 0 <= y < height:
+                visible[y * width + x] = 1
 
 
 class Player:
     """Represents a player in the game"""
     
+    __slots__ = ('id', 'name', 'color', 'score', 'armies', 'headquarters_position', 'is_eliminated')
+    
+    # (dx, dy) offsets within each visibility range, built on first use
+    _OFFSET_CACHE: Dict[int, np.ndarray] = {}
+    
     def __init__(self, player_id: int, name: str, color: Tuple[int, int, int]):
         self.id = player_id
         self.name = name
@@ -36,43 +59,84 @@ class Player:
             
     def calculate_visibility(self, board: Board, config: dict) -> Set[Tuple[int, int]]:
         """Calculate all tiles visible to this player's armies"""
-        visible_tiles = set()
-        
-        for army in self.armies:
-            # Get base visibility range based on the army's position
-            tile = board.get_tile(army.x, army.y)
-            base_range = config['visibility']['base_range']
-            
-            # Adjust for terrain
-            if tile.type == TileType.FOREST:
-                range_mod = config['visibility']['forest_penalty']
-            elif tile.type == TileType.MOUNTAIN:
-                range_mod = config['visibility']['mountain_bonus']
+        ys, xs = np.nonzero(self.visibility_mask(board, config))
+        return set(zip(xs.tolist(), ys.tolist()))
+        
+    def visibility_mask(self, board: Board, config: dict) -> np.ndarray:
+        """Tiles visible to this player's armies, as a (height, width) bool array"""
+        width, height = board.width, board.height
+        visible = np.zeros(width * height, dtype=np.uint8)
+        
+        type_grid = board.type_grid
+        visibility = config['visibility']
+        base_range = visibility['base_range']
+        forest_penalty = visibility['forest_penalty']
+        mountain_bonus = visibility['mountain_bonus']
+        
+        # Visibility depends only on where an army stands, so stacked armies
+        # share one diamond; stamp each occupied tile once
+        for x, y in {(army.x, army.y) for army in self.armies}:
+            # Adjust the base visibility range for the terrain the army stands on
+            tile_type = type_grid[y, x]
+            if tile_type == FOREST:
+                range_mod = forest_penalty
+            elif tile_type == MOUNTAIN:
+                range_mod = mountain_bonus
             else:
                 range_mod = 0
                 
             visibility_range = max(1, base_range + range_mod)
             
-            # Add all tiles within visibility range
-            for dx in range(-visibility_range, visibility_range + 1):
-                for dy in range(-visibility_range, visibility_range + 1):
-                    # Calculate distance (Manhattan for simplicity)
-                    distance = abs(dx) + abs(dy)
-                    if distance <= visibility_range:
-                        visible_x, visible_y = army.x + dx, army.y + dy
-                        if board.is_valid_position(visible_x, visible_y):
-                            visible_tiles.add((visible_x, visible_y))
-        
-        return visible_tiles
+            # Mark all tiles within visibility range (Manhattan distance)
+            if NUMBA_AVAILABLE:
+                _stamp_visibility(x, y, visibility_range, width, height, visible)
+                continue
+            coords = self._visibility_offsets(visibility_range) + (x, y)
+            on_board = ((coords[:, 0] >= 0) & (coords[:, 0] < width) &
+                        (coords[:, 1] >= 0) & (coords[:, 1] < height))
+            coords = coords[on_board]
+            visible[coords[:, 1] * width + coords[:, 0]] = 1
+            
+        return visible.view(np.bool_).reshape(height, width)
+        
+    @classmethod
+    def _visibility_offsets(cls, visibility_range: int) -> np.ndarray:
+        """Offsets of every tile within a Manhattan distance, as an (n, 2) array"""
+        offsets = cls._OFFSET_CACHE.get(visibility_range)
+        if offsets is None:
+            r = visibility_range
+            dx, dy = np.mgrid[-r:r + 1, -r:r + 1]
+            mask = np.abs(dx) + np.abs(dy) <= r
+            offsets = np.stack([dx[mask], dy[mask]], axis=1)
+            cls._OFFSET_CACHE[visibility_range] = offsets
+        return offsets
 
 
 class GameState:
     """Manages the overall state of the game"""
     
-    def __init__(self, board: Board, num_players: int = 2):
-        # Load configuration
-        with open('config.yaml', 'r') as f:
-            self.config = yaml.safe_load(f)
+    def __init__(self, board: Board, num_players: int = 2, setup: bool = True):
+        """
+        Create a game on board; unless setup is False, a new map is generated
+        and each player gets a headquarters and starting army
+        """
+        # Load configuration (parsed once per process and shared)
+        self.config = load_config()
+        
+        # Hoist the config values read every turn out of the nested dicts
+        self._supply_range = self.config['supply']['base_range']
+        consumption = self.config['supply']['consumption']
+        self._consumption = (consumption['stationary'], consumption['moving'], consumption['combat'])
+        self._fort_food = self.config['tiles']['fort']['food_generation']
+        self._starting_size = self.config['game']['starting_army_size']
+        self._starting_food = self.config['game']['starting_food']
+        self._turn_limit = self.config['game']['turn_limit']
+        self._fort_control = self.config['scoring']['fort_control']
+        self._elim_factor = self.config['scoring']['elimination_factor']
+        self._general_move_bonus = self.config['movement']['general_bonus']
+        self._build_movement_lut(self.config['movement']['tiers'])
+        self._base_attrition = self.config['combat']['base_attrition']
+        self._general_combat_bonus = self.config['combat']['general_bonus']
             
         self.board = board
         self.players: List[Player] = []
@@ -81,6 +145,7 @@ class GameState:
         self.game_over = False
         self.winner = None
         self.selected_army = None
+        self._game_over_dirty = True
         
         # Initialize players
         player_colors = self.config['colors']['players']
@@ -88,11 +153,20 @@ class GameState:
             player = Player(i, f"Player {i+1}", player_colors[i])
             self.players.append(player)
             
-        # Set up initial game state
-        self._setup_game()
+        # Set up initial game state (loaded games bring their own)
+        if setup:
+            self._setup_game()
+        else:
+            self._rebuild_active_order()
+        
+    def _rebuild_active_order(self):
+        """Indices of the players still in the game, in turn order"""
+        self._active_order = [i for i, player in enumerate(self.players) if not player.is_eliminated]
         
     def _setup_game(self):
         """Initialize the board and place starting armies"""
+        self._rebuild_active_order()
+        
         # Create a basic board layout
         self.board.generate_random_map(
             fort_count=5,
@@ -114,18 +188,16 @@ class GameState:
             hq_x, hq_y = headquarters_positions[i]
             player.headquarters_position = (hq_x, hq_y)
             
-            # Set the tile to headquarters type
-            self.board.get_tile(hq_x, hq_y).type = TileType.HEADQUARTERS
+            # Set the tile to headquarters type, owned by this player
+            self.board._set_tile_type(hq_x, hq_y, HQ)
+            self.board.owner_grid[hq_y, hq_x] = player.id
             
             # Create initial army
-            starting_size = self.config['game']['starting_army_size']
-            starting_food = self.config['game']['starting_food']
-            
             army = Army(
                 x=hq_x,
                 y=hq_y,
-                strength=starting_size,
-                food=starting_food,
+                strength=self._starting_size,
+                food=self._starting_food,
                 has_general=True,
                 player_id=player.id
             )
@@ -133,6 +205,21 @@ class GameState:
             player.add_army(army)
             self.board.add_army(army)
     
+    def _build_movement_lut(self, tiers: List[dict]):
+        """Tabulate movement speed by strength from the configured tiers"""
+        # Strengths past the last tier (and gaps between tiers) default to 1
+        self._movement_lut_max = max(tier['max'] for tier in tiers) + 1
+        lut = np.ones(self._movement_lut_max + 1, dtype=np.uint8)
+        for tier in reversed(tiers):
+            lut[tier['min']:tier['max'] + 1] = tier['speed']
+        
+        # Full movement range by [has_general][strength], as plain ints
+        speeds = lut.tolist()
+        self._movement_range = (
+            tuple(speeds),
+            tuple(speed + self._general_move_bonus for speed in speeds),
+        )
+    
     def get_current_player(self) -> Player:
         """Get the player whose turn it currently is"""
         return self.players[self.current_player_index]
@@ -141,45 +228,56 @@ class GameState:
         """Advance to the next player's turn"""
         # Process end-of-turn effects for current player
         self._process_end_of_turn()
+        self._game_over_dirty = True
         
-        # Move to next player
-        self.current_player_index = (self.current_player_index + 1) % len(self.players)
-        
-        # Skip eliminated players
-        while self.players[self.current_player_index].is_eliminated:
-            self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        # Drop the current player from the turn order if they were just eliminated
+        current = self.current_player_index
+        order = self._active_order
+        if self.players[current].is_eliminated and current in order:
+            order.remove(current)
             
-            # If we've gone full circle and all players are eliminated, end the game
-            if self.current_player_index == 0:
-                self.game_over = True
-                self._determine_winner()
-                break
-                
-        # If we've returned to player 0, increment turn counter
-        if self.current_player_index == 0:
+        # If every player is eliminated, end the game
+        if not order:
+            self.game_over = True
+            self._determine_winner()
+            return
+            
+        # Move to the next active player, wrapping round to start a new turn
+        position = bisect_right(order, current)
+        if position == len(order):
+            position = 0
             self.turn_number += 1
             
             # Check turn limit
-            if self.turn_number > self.config['game']['turn_limit']:
+            if self.turn_number > self._turn_limit:
                 self.game_over = True
                 self._determine_winner()
+                
+        self.current_player_index = order[position]
     
     def _process_end_of_turn(self):
         """Process all end-of-turn effects"""
         player = self.get_current_player()
         
+        stationary_food, moving_food, combat_food = self._consumption
+        hq_position = player.headquarters_position
+        tile_type = self.board._tile_type
+        dead = []
+        starved = False
+        
         # Process supply and food consumption
         for army in player.armies:
             # Check if army is in supply
             is_supplied = self._check_supply(army)
             
             # Consume food based on activity
-            if army.moved_this_turn and army.fought_this_turn:
-                food_consumption = self.config['supply']['consumption']['combat']
-            elif army.moved_this_turn:
-                food_consumption = self.config['supply']['consumption']['moving']
+            activity = army.flags & TURN_MASK
+            if activity == TURN_MASK:
+                food_consumption = combat_food
+            elif activity & MOVED:
+                food_consumption = moving_food
             else:
-                food_consumption = self.config['supply']['consumption']['stationary']
+                food_consumption = stationary_food
                 
             army.food -= food_consumption
             
@@ -189,58 +287,53 @@ class GameState:
                 strength_loss = min(abs(army.food) + 1, army.strength)
                 army.strength -= strength_loss
                 army.food = 0
+                starved = starved or strength_loss > 0
                 
-            # Generate food if on a fort
-            tile = self.board.get_tile(army.x, army.y)
-            if tile.type == TileType.FORT:
-                food_gen = self.config['tiles']['fort']['food_generation']
-                army.food += food_gen
-                
-            # Resupply if at headquarters
-            if tile.type == TileType.HEADQUARTERS and tile.player_id == player.id:
-                army.food = self.config['game']['starting_food']
+            # Generate food if on a fort, or resupply if at headquarters
+            if tile_type(army.x, army.y) == FORT:
+                army.food += self._fort_food
+            elif (army.x, army.y) == hq_position:
+                army.food = self._starting_food
                 
             # Reset turn flags
-            army.moved_this_turn = False
-            army.fought_this_turn = False
+            army.flags &= ~TURN_MASK
             
-            # Remove armies with zero strength
+            # Collect armies with zero strength for removal after the loop
             if army.strength <= 0:
-                self.board.remove_army(army)
-                player.remove_army(army)
+                dead.append(army)
+                
+        if dead:
+            self.board.remove_armies(dead)
+            player.armies = [army for army in player.armies if army.strength > 0]
+        elif starved:
+            # Strength changed in place; let board caches know
+            self.board.revision += 1
         
         # Check if player is eliminated (no armies left)
         if not player.armies:
             player.is_eliminated = True
             
         # Check for control of forts and add points
-        for x in range(self.board.width):
-            for y in range(self.board.height):
-                tile = self.board.get_tile(x, y)
-                if tile.type == TileType.FORT:
-                    armies_on_tile = self.board.get_armies_at(x, y)
-                    if armies_on_tile and all(a.player_id == player.id for a in armies_on_tile):
-                        player.score += self.config['scoring']['fort_control']
+        for x, y in self.board.fort_positions:
+            armies_on_tile = self.board.get_armies_at(x, y)
+            if armies_on_tile and all(a.player_id == player.id for a in armies_on_tile):
+                player.score += self._fort_control
     
     def _check_supply(self, army: Army) -> bool:
         """Check if an army is in supply (connected to HQ)"""
         player = self.players[army.player_id]
         
         # If at headquarters, automatically in supply
-        tile = self.board.get_tile(army.x, army.y)
-        if tile.type == TileType.HEADQUARTERS and tile.player_id == player.id:
+        hq_x, hq_y = player.headquarters_position
+        if army.x == hq_x and army.y == hq_y:
             return True
             
         # Check direct distance to headquarters
-        hq_x, hq_y = player.headquarters_position
-        distance = abs(army.x - hq_x) + abs(army.y - hq_y)
-        supply_range = self.config['supply']['base_range']
-        
-        if distance <= supply_range:
+        if abs(army.x - hq_x) + abs(army.y - hq_y) <= self._supply_range:
             return True
             
         # TODO: Implement supply chain checking (connect through friendly units)
-        # This would require pathfinding algorithms from NetworkX
+        # using utils.pathfinding.find_supply_chain
         
         return False
     
@@ -265,7 +358,8 @@ class GameState:
         Move an army to a new position if valid
         Returns True if successful, False otherwise
         """
-        if not self.board.is_valid_position(new_x, new_y):
+        board = self.board
+        if not (0 <= new_x < board.width and 0 <= new_y < board.height):
             return False
             
         # Check if the move is within range
@@ -274,34 +368,21 @@ class GameState:
             return False
             
         # Update position
-        old_x, old_y = army.x, army.y
         army.x, army.y = new_x, new_y
         
         # Mark as moved this turn
-        army.moved_this_turn = True
+        army.flags |= MOVED
         
         # Update board representation
-        self.board.move_army(army, old_x, old_y, new_x, new_y)
+        self.board.move_army(army, new_x, new_y)
         
         return True
     
     def _calculate_movement_range(self, army: Army) -> int:
         """Calculate how far an army can move based on its size and general"""
-        # Find the appropriate movement tier
-        movement_tiers = self.config['movement']['tiers']
-        base_movement = 1  # Default if no tier matches
-        
-        for tier in movement_tiers:
-            if tier['min'] <= army.strength <= tier['max']:
-                base_movement = tier['speed']
-                break
-                
-        # Apply general bonus if applicable
-        general_bonus = self.config['movement']['general_bonus'] if army.has_general else 0
-        
+        # Tier speed for this strength, with any general bonus already added
         # TODO: Apply terrain modifiers based on current tile
-        
-        return base_movement + general_bonus
+        return self._movement_range[army.has_general][min(max(army.strength, 0), self._movement_lut_max)]
     
     def split_army(self, army: Army, new_strength: int, new_food: int, 
                   keep_general: bool, new_x: int, new_y: int) -> Optional[Army]:
@@ -317,7 +398,8 @@ class GameState:
             return None
             
         # Check if target position is adjacent and valid
-        if not self.board.is_valid_position(new_x, new_y):
+        board = self.board
+        if not (0 <= new_x < board.width and 0 <= new_y < board.height):
             return None
             
         if abs(new_x - army.x) + abs(new_y - army.y) != 1:
@@ -345,8 +427,8 @@ class GameState:
         player.add_army(new_army)
         
         # Mark both armies as moved this turn
-        army.moved_this_turn = True
-        new_army.moved_this_turn = True
+        army.flags |= MOVED
+        new_army.flags |= MOVED
         
         return new_army
     
@@ -377,7 +459,37 @@ class GameState:
         player.remove_army(army2)
         
         # Mark as moved this turn
-        army1.moved_this_turn = True
+        army1.flags |= MOVED
+        
+        return True
+    
+    def merge_armies_many(self, primary: Army, others: List[Army]) -> bool:
+        """
+        Merge several armies into primary in one pass
+        Armies must belong to primary's player and share its tile or be adjacent
+        to it; any others are left alone. Returns True if anything was merged
+        """
+        player_id, x, y = primary.player_id, primary.x, primary.y
+        merged = [army for army in others
+                  if army is not primary and army.player_id == player_id
+                  and abs(army.x - x) + abs(army.y - y) <= 1]
+        if not merged:
+            return False
+            
+        # Combine strength and food, keeping any general
+        primary.strength += sum(army.strength for army in merged)
+        primary.food += sum(army.food for army in merged)
+        if any(army.has_general for army in merged):
+            primary.has_general = True
+            
+        # Remove the merged armies from the board and their player together
+        self.board.remove_armies(merged)
+        merged_ids = {id(army) for army in merged}
+        player = self.players[player_id]
+        player.armies = [army for army in player.armies if id(army) not in merged_ids]
+        
+        # Mark as moved this turn
+        primary.flags |= MOVED
         
         return True
     
@@ -401,83 +513,92 @@ class GameState:
     
     def update(self):
         """Update game state (for animations, etc.)"""
-        # Process combat between armies of different players
-        self._resolve_combat()
-        
-        # Check for game over conditions
-        self._check_game_over()
+        # Process combat between armies of different players, only once
+        # armies have been placed or moved since the last check
+        if self.board.combat_dirty:
+            self.board.combat_dirty = False
+            self._resolve_combat()
+        
+        # Check for game over conditions, which only change between turns
+        if self._game_over_dirty:
+            self._game_over_dirty = False
+            self._check_game_over()
     
     def _resolve_combat(self):
         """Resolve combat between opposing armies"""
-        # Get all positions with armies
-        positions_with_armies = {}
-        for x in range(self.board.width):
-            for y in range(self.board.height):
-                armies = self.board.get_armies_at(x, y)
-                if armies:
-                    positions_with_armies[(x, y)] = armies
-        
-        # Find positions with armies from different players (contact positions)
+        # Find positions with armies from different players (contact positions),
+        # straight from the board's index of occupied tiles
+        width = self.board.width
         contact_positions = []
-        for pos, armies in positions_with_armies.items():
-            player_ids = set(army.player_id for army in armies)
-            if len(player_ids) > 1:
-                contact_positions.append(pos)
-                
-        # Process combat at each contact position
+        for key, armies in self.board.armies_by_position.items():
+            if len(armies) > 1:
+                player_id = armies[0].player_id
+                if any(army.player_id != player_id for army in armies):
+                    y, x = divmod(key, width)
+                    contact_positions.append((x, y))
+                    
+        if not contact_positions:
+            return
+        self.board.revision += 1
+            
+        # Tiles each player's armies are on or next to, for elimination scoring
+        contact_by_player = self._contact_positions_by_player()
+        
+        # Process combat at each contact position, in column order as before
+        contact_positions.sort()
         for x, y in contact_positions:
             armies = self.board.get_armies_at(x, y)
-            self._process_combat_at_position(x, y, armies)
+            self._process_combat_at_position(x, y, armies, contact_by_player)
+            
+    def _contact_positions_by_player(self) -> Dict[int, Set[Tuple[int, int]]]:
+        """Positions within one step of each player's armies"""
+        return {
+            player.id: {(army.x + dx, army.y + dy)
+                        for army in player.armies
+                        for dx, dy in ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1))}
+            for player in self.players
+        }
                 
-    def _process_combat_at_position(self, x: int, y: int, armies: List[Army]):
+    def _process_combat_at_position(self, x: int, y: int, armies: List[Army],
+                                    contact_by_player: Optional[Dict[int, Set[Tuple[int, int]]]] = None):
         """Process combat between armies at a specific position"""
-        # Group armies by player
-        armies_by_player = {}
+        # Group armies by player in one pass, totalling strength and noting
+        # generals as we go: player_id -> [strength, has_general, armies]
+        sides = defaultdict(lambda: [0, False, []])
         for army in armies:
-            if army.player_id not in armies_by_player:
-                armies_by_player[army.player_id] = []
-            armies_by_player[army.player_id].append(army)
-            
-        # Calculate total strength per player
-        strength_by_player = {}
-        has_general_by_player = {}
-        for player_id, player_armies in armies_by_player.items():
-            strength_by_player[player_id] = sum(army.strength for army in player_armies)
-            has_general_by_player[player_id] = any(army.has_general for army in player_armies)
-            
-        # Calculate strength differences and apply combat effects
-        for attacker_id, attacker_armies in armies_by_player.items():
-            for defender_id, defender_armies in armies_by_player.items():
-                if attacker_id != defender_id:
-                    attacker_strength = strength_by_player[attacker_id]
-                    defender_strength = strength_by_player[defender_id]
-                    
-                    # Calculate base damage (percentage of opponent's strength)
-                    base_attrition = self.config['combat']['base_attrition']
-                    
-                    # Size difference penalty
-                    size_difference = max(0, defender_strength - attacker_strength)
-                    size_penalty = self.config['combat']['size_penalty'] * (size_difference / 20)
-                    
-                    # General bonus
-                    attacker_general_bonus = self.config['combat']['general_bonus'] if has_general_by_player[attacker_id] else 0
-                    
-                    # TODO: Account for flanking and terrain
-                    
-                    # Calculate final damage percentage
-                    damage_percentage = base_attrition + attacker_general_bonus
-                    
-                    # Calculate damage dealt
-                    damage = int(attacker_strength * damage_percentage)
-                    
-                    # Apply damage proportionally to defender's armies
-                    self._apply_damage_to_armies(defender_armies, damage)
+            side = sides[army.player_id]
+            side[0] += army.strength
+            side[1] = side[1] or army.has_general
+            side[2].append(army)
+            
+        # Damage depends only on the attacking side, so work it out once each
+        groups = [(side[2], self._combat_damage(side[0], side[1])) for side in sides.values()]
+        
+        # Each pair of players fights once, dealing damage in both directions
+        # from the strengths at the start of the fight
+        for i, (first_armies, first_damage) in enumerate(groups):
+            for second_armies, second_damage in groups[i + 1:]:
+                # Apply damage proportionally to each side's armies
+                self._apply_damage_to_armies(second_armies, first_damage, contact_by_player)
+                self._apply_damage_to_armies(first_armies, second_damage, contact_by_player)
+                
+                # Mark armies as having fought this turn
+                for army in first_armies:
+                    army.flags |= FOUGHT
+                for army in second_armies:
+                    army.flags |= FOUGHT
                     
-                    # Mark armies as having fought this turn
-                    for army in attacker_armies + defender_armies:
-                        army.fought_this_turn = True
+    def _combat_damage(self, attacker_strength: int, has_general: bool) -> int:
+        """Damage an attacking side deals: a percentage of its own strength"""
+        # General bonus
+        general_bonus = self._general_combat_bonus if has_general else 0
+        
+        # TODO: Account for size difference, flanking and terrain
+        
+        return int(attacker_strength * (self._base_attrition + general_bonus))
                         
-    def _apply_damage_to_armies(self, armies: List[Army], total_damage: int):
+    def _apply_damage_to_armies(self, armies: List[Army], total_damage: int,
+                                contact_by_player: Optional[Dict[int, Set[Tuple[int, int]]]] = None):
         """Apply damage proportionally across multiple armies"""
         # Calculate total strength
         total_strength = sum(army.strength for army in armies)
@@ -496,26 +617,24 @@ class GameState:
             army.strength -= army_damage
             remaining_damage -= army_damage
             
-            # Check if any armies were eliminated
-            eliminated_armies = [army for army in armies if army.strength <= 0]
-            for eliminated in eliminated_armies:
-                # Award points to all players who dealt damage to this army
-                for player in self.players:
-                    if player.id != eliminated.player_id:
-                        # Check if any of this player's armies are in contact
-                        is_in_contact = False
-                        for player_army in player.armies:
-                            if abs(player_army.x - eliminated.x) + abs(player_army.y - eliminated.y) <= 1:
-                                is_in_contact = True
-                                break
-                                
-                        if is_in_contact:
-                            elimination_points = int(self.config['scoring']['elimination_factor'] * eliminated.strength)
-                            player.score += elimination_points
-                            
-                # Remove the eliminated army
-                self.board.remove_army(eliminated)
-                self.players[eliminated.player_id].remove_army(eliminated)
+        # Check if any armies were eliminated, once the damage is distributed
+        eliminated_armies = [army for army in armies if army.strength <= 0]
+        if eliminated_armies and contact_by_player is None:
+            contact_by_player = self._contact_positions_by_player()
+            
+        for eliminated in eliminated_armies:
+            # Award points to all players who dealt damage to this army
+            position = (eliminated.x, eliminated.y)
+            for player in self.players:
+                if player.id != eliminated.player_id:
+                    # Check if any of this player's armies are in contact
+                    if position in contact_by_player[player.id]:
+                        elimination_points = int(self._elim_factor * eliminated.strength)
+                        player.score += elimination_points
+                        
+            # Remove the eliminated army
+            self.board.remove_army(eliminated)
+            self.players[eliminated.player_id].remove_army(eliminated)
                 
     def _check_game_over(self):
         """Check if game over conditions have been met"""
@@ -528,6 +647,6 @@ class GameState:
             self._determine_winner()
             
         # Check turn limit
-        if self.turn_number > self.config['game']['turn_limit']:
+        if self.turn_number > self._turn_limit:
             self.game_over = True
             self._determine_winner()
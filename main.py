@@ -26,6 +26,25 @@ FPS = 60
 TITLE = "Strategic Conquest"
 
 
+def _on_quit(event, renderer) -> bool:
+    """Window closed: stop the game loop"""
+    return True
+
+
+def _on_mouse_down(event, renderer) -> bool:
+    """Forward left clicks to the board renderer"""
+    if event.button == 1:  # Left click
+        renderer.handle_click(event.pos)
+    return False
+
+
+# Game-specific event handlers by event type; each returns True to quit
+_HANDLERS = {
+    QUIT: _on_quit,
+    MOUSEBUTTONDOWN: _on_mouse_down,
+}
+
+
 def main():
     """Main function to run the game"""
     # Setup display
@@ -42,31 +61,35 @@ def main():
     renderer = GameRenderer(screen, game_state)
     ui_controls = UIControls(ui_manager, game_state, renderer)
     
+    # Bind per-frame calls to locals once
+    event_get = pygame.event.get
+    flip = pygame.display.flip
+    handlers_get = _HANDLERS.get
+    
     # Main game loop
     running = True
     while running:
         time_delta = clock.tick(FPS) / 1000.0
         
         # Handle events
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                running = False
-            
+        events = event_get()
+        for event in events:
             # Pass events to UI manager
             ui_manager.process_events(event)
             
-            # Pass events to UI controls
-            ui_controls.process_events(event)
-            
             # Handle game-specific events
-            if event.type == MOUSEBUTTONDOWN:
-                if event.button == 1:  # Left click
-                    renderer.handle_click(event.pos)
+            handler = handlers_get(event.type)
+            if handler is not None and handler(event, renderer):
+                running = False
+                
+        # Pass the frame's events to UI controls together
+        ui_controls.process_events_batch(events)
         
         # Update game state if needed (for animations, AI turns, etc.)
         game_state.update()
         
         # Update UI
+        ui_controls.update(time_delta)
         ui_manager.update(time_delta)
         
         # Render everything
@@ -74,7 +97,7 @@ def main():
         renderer.render()  # Draw game elements
         ui_manager.draw_ui(screen)  # Draw UI elements
         
-        pygame.display.flip()  # Update display
+        flip()  # Update display
     
     # Clean up
     pygame.quit()
@@ -3,9 +3,10 @@ UI Controls for Strategic Conquest
 Handles buttons, panels and user interaction elements
 """
 
+from collections import namedtuple
 import pygame
 import pygame_gui
-from pygame_gui.elements import UIButton, UIPanel, UILabel, UIHorizontalSlider, UITextBox
+from pygame_gui.elements import UIButton, UIPanel, UILabel, UIHorizontalSlider
 from typing import Dict, Tuple, List, Optional, Any
 
 from game.state import GameState
@@ -13,9 +14,36 @@ from game.army import Army
 from ui.renderer import GameRenderer
 
 
+# The only event type the controls react to (pygame_gui posts its events as these)
+_USEREVENT = pygame.USEREVENT
+
+
+# Positions of the split dialog's widgets, relative to the dialog
+_SplitDialogLayout = namedtuple('_SplitDialogLayout', [
+    'dialog', 'title', 'strength_label', 'strength_slider', 'keep_label', 'new_label',
+    'food_label', 'food_slider', 'keep_food_label', 'new_food_label',
+    'general_button', 'confirm_button', 'cancel_button'
+])
+
+
 class UIControls:
     """Manages UI controls and interactions"""
     
+    __slots__ = (
+        'ui_manager', 'game_state', 'renderer', 'screen_width', 'screen_height',
+        'control_panel', 'end_turn_button', 'new_game_button',
+        'army_panel', 'split_button', 'merge_button', 'retreat_button',
+        '_button_handlers', '_btn_enabled', '_btn_state_key', '_game_over_applied', '_parm_cache_key', '_parm_cache_val',
+        '_update_accum', '_update_interval', '_controls_dirty', '_seen_state',
+        'split_dialog', 'split_slider', 'split_food_slider', 'split_general_button',
+        'split_keep_label', 'split_new_label', 'split_keep_food_label', 'split_new_food_label',
+        'split_confirm_button', 'split_cancel_button', 'splitting_army', '_split_keep_general',
+        '_pending_strength', '_pending_food', '_last_strength_val', '_last_food_val'
+    )
+    
+    # Split dialog layout, built on first use (see _get_layout_rects)
+    _layout: Optional[_SplitDialogLayout] = None
+    
     def __init__(self, ui_manager: pygame_gui.UIManager, game_state: GameState, renderer: GameRenderer):
         self.ui_manager = ui_manager
         self.game_state = game_state
@@ -28,15 +56,60 @@ class UIControls:
         self._create_game_controls()
         self._create_army_controls()
         
+        # Button press handlers keyed by the id of their button; the split
+        # dialog adds its own while it is open
+        self._button_handlers = {
+            id(self.end_turn_button): self._do_end_turn,
+            id(self.new_game_button): self._do_new_game,
+            id(self.split_button): self._show_split_dialog,
+            id(self.merge_button): self._handle_merge,
+            id(self.retreat_button): self._handle_retreat,
+        }
+        
+        # Enabled state last applied to each control button (None until first set)
+        self._btn_enabled = {
+            id(button): None
+            for button in (self.end_turn_button, self.split_button, self.merge_button, self.retreat_button)
+        }
+        
+        # Inputs the button states were last computed from, and whether the
+        # game-over lockout has already been applied
+        self._btn_state_key = None
+        self._game_over_applied = False
+        
+        # Last _player_armies_at lookup and the state it was computed from
+        self._parm_cache_key = None
+        self._parm_cache_val = []
+        
+        # Button states refresh at most every _update_interval seconds, and only
+        # once marked dirty by an action, a selection change, or the board or
+        # game-over state changing underneath them
+        self._update_accum = 0.0
+        self._update_interval = 0.1
+        self._controls_dirty = True
+        self._seen_state = None
+        renderer.selection_listeners.append(self.invalidate)
+        
         # Split dialog state
         self.split_dialog = None
         self.split_slider = None
         self.split_food_slider = None
         self.split_general_button = None
         self.splitting_army = None
+        self._split_keep_general = True
+        
+        # Latest slider values not yet shown in the dialog labels
+        self._pending_strength = None
+        self._pending_food = None
+        
+        # Slider values the dialog labels currently reflect
+        self._last_strength_val = 1
+        self._last_food_val = 1
         
     def _create_game_controls(self):
         """Create main game control buttons"""
+        manager = self.ui_manager
+        
         # Create control panel
         control_panel_rect = pygame.Rect(
             10, self.screen_height - 60, 300, 50
@@ -44,8 +117,9 @@ class UIControls:
         self.control_panel = UIPanel(
             relative_rect=control_panel_rect,
             starting_layer_height=1,
-            manager=self.ui_manager
+            manager=manager
         )
+        container = self.control_panel
         
         # End Turn button
         end_turn_rect = pygame.Rect(
@@ -54,8 +128,8 @@ class UIControls:
         self.end_turn_button = UIButton(
             relative_rect=end_turn_rect,
             text="End Turn",
-            manager=self.ui_manager,
-            container=self.control_panel
+            manager=manager,
+            container=container
         )
         
         # New Game button
@@ -65,12 +139,14 @@ class UIControls:
         self.new_game_button = UIButton(
             relative_rect=new_game_rect,
             text="New Game",
-            manager=self.ui_manager,
-            container=self.control_panel
+            manager=manager,
+            container=container
         )
         
     def _create_army_controls(self):
         """Create controls for army management"""
+        manager = self.ui_manager
+        
         # Create army panel
         army_panel_rect = pygame.Rect(
             self.screen_width - 310, self.screen_height - 60, 300, 50
@@ -78,8 +154,9 @@ class UIControls:
         self.army_panel = UIPanel(
             relative_rect=army_panel_rect,
             starting_layer_height=1,
-            manager=self.ui_manager
+            manager=manager
         )
+        container = self.army_panel
         
         # Split button
         split_rect = pygame.Rect(
@@ -88,8 +165,8 @@ class UIControls:
         self.split_button = UIButton(
             relative_rect=split_rect,
             text="Split",
-            manager=self.ui_manager,
-            container=self.army_panel
+            manager=manager,
+            container=container
         )
         
         # Merge button
@@ -99,8 +176,8 @@ class UIControls:
         self.merge_button = UIButton(
             relative_rect=merge_rect,
             text="Merge",
-            manager=self.ui_manager,
-            container=self.army_panel
+            manager=manager,
+            container=container
         )
         
         # Retreat button
@@ -110,67 +187,133 @@ class UIControls:
         self.retreat_button = UIButton(
             relative_rect=retreat_rect,
             text="Retreat",
-            manager=self.ui_manager,
-            container=self.army_panel
+            manager=manager,
+            container=container
         )
         
     def process_events(self, event: pygame.event.Event):
         """Process UI events"""
-        if event.type == pygame.USEREVENT:
-            if event.user_type == pygame_gui.UI_BUTTON_PRESSED:
-                self._handle_button_press(event)
-            elif event.user_type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
-                self._handle_slider_moved(event)
+        # Most events are mouse motion and the like; drop them before anything else
+        if event.type != _USEREVENT:
+            return
+            
+        if event.user_type == pygame_gui.UI_BUTTON_PRESSED:
+            self._handle_button_press(event)
+        elif event.user_type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
+            self._handle_slider_moved(event)
+                
+    def process_events_batch(self, events: List[pygame.event.Event]):
+        """Process a frame's worth of events in one call"""
+        handle_button = self._handle_button_press
+        handle_slider = self._handle_slider_moved
+        button_pressed = pygame_gui.UI_BUTTON_PRESSED
+        slider_moved = pygame_gui.UI_HORIZONTAL_SLIDER_MOVED
+        # Buttons are handled in order; for each slider only its last move counts
+        latest_slider_moves = {}
+        for event in events:
+            if event.type != _USEREVENT:
+                continue
+            user_type = event.user_type
+            if user_type == button_pressed:
+                handle_button(event)
+            elif user_type == slider_moved:
+                latest_slider_moves[id(event.ui_element)] = event
                 
+        for event in latest_slider_moves.values():
+            handle_slider(event)
+                
+    def invalidate(self):
+        """Refresh button states on the next update, without waiting for the interval"""
+        self._controls_dirty = True
+        self._btn_state_key = None
+        self._update_accum = self._update_interval
+        
     def _handle_button_press(self, event: pygame.event.Event):
         """Handle button press events"""
-        if event.ui_element == self.end_turn_button:
-            self.game_state.next_turn()
-            self.renderer.selected_position = None
-            self.renderer.highlighted_positions.clear()
-        elif event.ui_element == self.new_game_button:
-            # Reset game
-            self.game_state.board.generate_random_map()
-            self.game_state._setup_game()
-            self.game_state.turn_number = 1
-            self.game_state.current_player_index = 0
-            self.game_state.game_over = False
-            self.game_state.winner = None
-            self.renderer.selected_position = None
-            self.renderer.highlighted_positions.clear()
-        elif event.ui_element == self.split_button:
-            self._show_split_dialog()
-        elif event.ui_element == self.merge_button:
-            self._handle_merge()
-        elif event.ui_element == self.retreat_button:
-            self._handle_retreat()
-        elif self.split_dialog and event.ui_element == self.split_general_button:
-            # Toggle general assignment in split dialog
-            if self.split_general_button.text == "Keep General":
-                self.split_general_button.set_text("Send General")
-            else:
-                self.split_general_button.set_text("Keep General")
-        elif self.split_dialog and event.ui_element == self.split_confirm_button:
-            self._handle_split_confirm()
-        elif self.split_dialog and event.ui_element == self.split_cancel_button:
-            self._close_split_dialog()
+        self.invalidate()
+        handler = self._button_handlers.get(id(event.ui_element))
+        if handler is not None:
+            handler()
+            
+    def _do_end_turn(self):
+        """End the current player's turn"""
+        self.game_state.next_turn()
+        self.renderer.clear_selection()
+        
+    def _do_new_game(self):
+        """Reset the game"""
+        self.game_state.board.generate_random_map()
+        self.game_state._setup_game()
+        self.game_state.turn_number = 1
+        self.game_state.current_player_index = 0
+        self.game_state.game_over = False
+        self.game_state.winner = None
+        self._game_over_applied = False
+        self.renderer.clear_selection()
+        
+    def _toggle_split_general(self):
+        """Toggle general assignment in the split dialog"""
+        self._split_keep_general = not self._split_keep_general
+        self.split_general_button.set_text("Keep General" if self._split_keep_general else "Send General")
             
     def _handle_slider_moved(self, event: pygame.event.Event):
         """Handle slider movement events"""
+        # Only note the latest values; the labels are updated once per frame in update().
+        # Most pixel moves land on the same whole value, so skip those entirely
         if self.split_dialog and event.ui_element == self.split_slider:
-            # Update the labels showing split values
-            if self.splitting_army:
-                strength_value = int(self.split_slider.get_current_value())
+            value = int(self.split_slider.get_current_value())
+            if value != self._last_strength_val:
+                self._last_strength_val = value
+                self._pending_strength = value
+                
+        if self.split_dialog and event.ui_element == self.split_food_slider:
+            value = int(self.split_food_slider.get_current_value())
+            if value != self._last_food_val:
+                self._last_food_val = value
+                self._pending_food = value
+            
+    def _apply_pending_split_labels(self):
+        """Show the latest slider values in the split dialog labels"""
+        if self.split_dialog and self.splitting_army:
+            if self._pending_strength is not None:
+                # Update the labels showing split values
+                strength_value = self._pending_strength
                 self.split_keep_label.set_text(f"Keep: {self.splitting_army.strength - strength_value}")
                 self.split_new_label.set_text(f"New: {strength_value}")
                 
-        if self.split_dialog and event.ui_element == self.split_food_slider:
-            # Update the labels showing food split values
-            if self.splitting_army:
-                food_value = int(self.split_food_slider.get_current_value())
+            if self._pending_food is not None:
+                # Update the labels showing food split values
+                food_value = self._pending_food
                 self.split_keep_food_label.set_text(f"Keep: {self.splitting_army.food - food_value}")
                 self.split_new_food_label.set_text(f"New: {food_value}")
                 
+        self._pending_strength = None
+        self._pending_food = None
+                
+    @classmethod
+    def _get_layout_rects(cls) -> _SplitDialogLayout:
+        """Rects for the split dialog; its geometry is fixed, so they are built once"""
+        if cls._layout is None:
+            dialog_width = 300
+            dialog_height = 300
+            half_width = (dialog_width - 40) // 2
+            cls._layout = _SplitDialogLayout(
+                dialog=pygame.Rect(0, 0, dialog_width, dialog_height),
+                title=pygame.Rect(10, 10, dialog_width - 20, 30),
+                strength_label=pygame.Rect(10, 50, dialog_width - 20, 20),
+                strength_slider=pygame.Rect(20, 80, dialog_width - 40, 20),
+                keep_label=pygame.Rect(20, 100, half_width, 20),
+                new_label=pygame.Rect(half_width + 20, 100, half_width, 20),
+                food_label=pygame.Rect(10, 130, dialog_width - 20, 20),
+                food_slider=pygame.Rect(20, 160, dialog_width - 40, 20),
+                keep_food_label=pygame.Rect(20, 180, half_width, 20),
+                new_food_label=pygame.Rect(half_width + 20, 180, half_width, 20),
+                general_button=pygame.Rect((dialog_width - 150) // 2, 210, 150, 30),
+                confirm_button=pygame.Rect(20, 250, 120, 30),
+                cancel_button=pygame.Rect(160, 250, 120, 30),
+            )
+        return cls._layout
+        
     def _show_split_dialog(self):
         """Show the army splitting dialog"""
         # Check if an army is selected
@@ -178,11 +321,7 @@ class UIControls:
             return
             
         x, y = self.renderer.selected_position
-        armies = self.game_state.board.get_armies_at(x, y)
-        current_player = self.game_state.get_current_player()
-        
-        # Filter for current player's armies
-        player_armies = [a for a in armies if a.player_id == current_player.id]
+        player_armies = self._player_armies_at(x, y)
         if not player_armies:
             return
             
@@ -194,164 +333,165 @@ class UIControls:
         if not army.can_split():
             return
             
-        # Create split dialog
-        dialog_width = 300
-        dialog_height = 300
-        dialog_rect = pygame.Rect(
-            (self.screen_width - dialog_width) // 2,
-            (self.screen_height - dialog_height) // 2,
-            dialog_width,
-            dialog_height
-        )
+        # Build the dialog once, then reuse it for every later split
+        if self.split_dialog is None:
+            self._build_split_dialog()
+        else:
+            self._reset_split_dialog(army)
+            
+        # Re-showing the panel shows every child, so settle the general button last
+        self.split_dialog.show()
+        if not army.has_general:
+            self.split_general_button.hide()
+            
+    def _build_split_dialog(self):
+        """Create the split dialog widgets for the army being split"""
+        army = self.splitting_army
+        manager = self.ui_manager
+        layout = self._get_layout_rects()
+        dialog_rect = layout.dialog.copy()
+        dialog_rect.center = (self.screen_width // 2, self.screen_height // 2)
         
         self.split_dialog = UIPanel(
             relative_rect=dialog_rect,
             starting_layer_height=1,
-            manager=self.ui_manager
+            manager=manager
         )
+        container = self.split_dialog
         
         # Title
-        title_rect = pygame.Rect(
-            10, 10, dialog_width - 20, 30
-        )
         UILabel(
-            relative_rect=title_rect,
+            relative_rect=layout.title,
             text="Split Army",
-            manager=self.ui_manager,
-            container=self.split_dialog
+            manager=manager,
+            container=container
         )
         
         # Strength slider
-        strength_label_rect = pygame.Rect(
-            10, 50, dialog_width - 20, 20
-        )
         UILabel(
-            relative_rect=strength_label_rect,
+            relative_rect=layout.strength_label,
             text="New Army Strength",
-            manager=self.ui_manager,
-            container=self.split_dialog
+            manager=manager,
+            container=container
         )
         
-        slider_rect = pygame.Rect(
-            20, 80, dialog_width - 40, 20
-        )
-        self.split_slider = UIHorizontalSlider(
-            relative_rect=slider_rect,
-            start_value=1,
-            value_range=(1, army.strength - 1),
-            manager=self.ui_manager,
-            container=self.split_dialog
-        )
+        self.split_slider = self._build_split_slider(layout.strength_slider, army.strength - 1)
         
         # Labels for split values
-        keep_label_rect = pygame.Rect(
-            20, 100, (dialog_width - 40) // 2, 20
-        )
         self.split_keep_label = UILabel(
-            relative_rect=keep_label_rect,
+            relative_rect=layout.keep_label,
             text=f"Keep: {army.strength - 1}",
-            manager=self.ui_manager,
-            container=self.split_dialog
+            manager=manager,
+            container=container
         )
         
-        new_label_rect = pygame.Rect(
-            (dialog_width - 40) // 2 + 20, 100, (dialog_width - 40) // 2, 20
-        )
         self.split_new_label = UILabel(
-            relative_rect=new_label_rect,
+            relative_rect=layout.new_label,
             text=f"New: 1",
-            manager=self.ui_manager,
-            container=self.split_dialog
+            manager=manager,
+            container=container
         )
         
         # Food slider
-        food_label_rect = pygame.Rect(
-            10, 130, dialog_width - 20, 20
-        )
         UILabel(
-            relative_rect=food_label_rect,
+            relative_rect=layout.food_label,
             text="New Army Food",
-            manager=self.ui_manager,
-            container=self.split_dialog
+            manager=manager,
+            container=container
         )
         
-        food_slider_rect = pygame.Rect(
-            20, 160, dialog_width - 40, 20
-        )
-        self.split_food_slider = UIHorizontalSlider(
-            relative_rect=food_slider_rect,
-            start_value=1,
-            value_range=(1, army.food - 1),
-            manager=self.ui_manager,
-            container=self.split_dialog
-        )
+        self.split_food_slider = self._build_split_slider(layout.food_slider, army.food - 1)
         
         # Labels for food split values
-        keep_food_label_rect = pygame.Rect(
-            20, 180, (dialog_width - 40) // 2, 20
-        )
         self.split_keep_food_label = UILabel(
-            relative_rect=keep_food_label_rect,
+            relative_rect=layout.keep_food_label,
             text=f"Keep: {army.food - 1}",
-            manager=self.ui_manager,
-            container=self.split_dialog
+            manager=manager,
+            container=container
         )
         
-        new_food_label_rect = pygame.Rect(
-            (dialog_width - 40) // 2 + 20, 180, (dialog_width - 40) // 2, 20
-        )
         self.split_new_food_label = UILabel(
-            relative_rect=new_food_label_rect,
+            relative_rect=layout.new_food_label,
             text=f"New: 1",
-            manager=self.ui_manager,
-            container=self.split_dialog
+            manager=manager,
+            container=container
         )
         
-        # General assignment (only if army has a general)
-        if army.has_general:
-            general_button_rect = pygame.Rect(
-                (dialog_width - 150) // 2, 210, 150, 30
-            )
-            self.split_general_button = UIButton(
-                relative_rect=general_button_rect,
-                text="Keep General",
-                manager=self.ui_manager,
-                container=self.split_dialog
-            )
-        else:
-            self.split_general_button = None
+        # General assignment (hidden for armies without a general)
+        self.split_general_button = UIButton(
+            relative_rect=layout.general_button,
+            text="Keep General",
+            manager=manager,
+            container=container
+        )
             
         # Confirm and Cancel buttons
-        confirm_rect = pygame.Rect(
-            20, 250, 120, 30
-        )
         self.split_confirm_button = UIButton(
-            relative_rect=confirm_rect,
+            relative_rect=layout.confirm_button,
             text="Confirm",
-            manager=self.ui_manager,
-            container=self.split_dialog
+            manager=manager,
+            container=container
         )
         
-        cancel_rect = pygame.Rect(
-            160, 250, 120, 30
-        )
         self.split_cancel_button = UIButton(
-            relative_rect=cancel_rect,
+            relative_rect=layout.cancel_button,
             text="Cancel",
+            manager=manager,
+            container=container
+        )
+        
+        # Route the dialog's buttons; hidden buttons never report presses
+        self._button_handlers[id(self.split_confirm_button)] = self._handle_split_confirm
+        self._button_handlers[id(self.split_cancel_button)] = self._close_split_dialog
+        self._button_handlers[id(self.split_general_button)] = self._toggle_split_general
+        
+    def _build_split_slider(self, rect: pygame.Rect, max_value: int) -> UIHorizontalSlider:
+        """A split dialog slider choosing from 1 to max_value, starting at 1"""
+        return UIHorizontalSlider(
+            relative_rect=rect,
+            start_value=1,
+            value_range=(1, max_value),
             manager=self.ui_manager,
             container=self.split_dialog
         )
         
+    def _reset_split_slider(self, slider: UIHorizontalSlider, rect: pygame.Rect,
+                            max_value: int) -> UIHorizontalSlider:
+        """Return slider moved back to 1, or a new one if its range must change"""
+        # pygame_gui has no range setter, and set_current_value leaves the handle
+        # where it was for a single-value range, so rebuild in those cases
+        if slider.value_range == (1, max_value) and max_value > 1:
+            slider.set_current_value(1)
+            return slider
+        slider.kill()
+        return self._build_split_slider(rect, max_value)
+        
+    def _reset_split_dialog(self, army):
+        """Point the existing split dialog widgets at a new army"""
+        layout = self._get_layout_rects()
+        self.split_slider = self._reset_split_slider(self.split_slider, layout.strength_slider, army.strength - 1)
+        self.split_food_slider = self._reset_split_slider(self.split_food_slider, layout.food_slider, army.food - 1)
+        
+        self.split_keep_label.set_text(f"Keep: {army.strength - 1}")
+        self.split_new_label.set_text("New: 1")
+        self.split_keep_food_label.set_text(f"Keep: {army.food - 1}")
+        self.split_new_food_label.set_text("New: 1")
+        
+        # A fresh split starts with the general staying put
+        if not self._split_keep_general:
+            self._split_keep_general = True
+            self.split_general_button.set_text("Keep General")
+            
+        # Drop slider values left over from the previous split
+        self._pending_strength = None
+        self._pending_food = None
+        self._last_strength_val = 1
+        self._last_food_val = 1
+        
     def _close_split_dialog(self):
-        """Close the split dialog"""
+        """Hide the split dialog, keeping its widgets for the next split"""
         if self.split_dialog:
-            self.split_dialog.kill()
-            self.split_dialog = None
-            self.split_slider = None
-            self.split_food_slider = None
-            self.split_general_button = None
-            self.split_confirm_button = None
-            self.split_cancel_button = None
+            self.split_dialog.hide()
             self.splitting_army = None
             
     def _handle_split_confirm(self):
@@ -365,25 +505,17 @@ class UIControls:
         new_food = int(self.split_food_slider.get_current_value())
         
         # Determine general assignment
-        keep_general = True
-        if self.split_general_button:
-            keep_general = self.split_general_button.text == "Keep General"
-            
-        # Find a valid adjacent position for the new army
-        valid_positions = []
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            new_x = self.splitting_army.x + dx
-            new_y = self.splitting_army.y + dy
+        keep_general = self._split_keep_general or not self.splitting_army.has_general
             
-            if self.game_state.board.is_valid_position(new_x, new_y):
-                valid_positions.append((new_x, new_y))
-                
-        if not valid_positions:
+        # Use the first valid adjacent position for the new army
+        is_valid = self.game_state.board.is_valid_position
+        ax, ay = self.splitting_army.x, self.splitting_army.y
+        new_pos = next(((ax + dx, ay + dy) for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                        if is_valid(ax + dx, ay + dy)), None)
+        if new_pos is None:
             self._close_split_dialog()
             return
-            
-        # For now, just use the first valid position
-        new_x, new_y = valid_positions[0]
+        new_x, new_y = new_pos
         
         # Perform the split
         new_army = self.game_state.split_army(
@@ -397,6 +529,23 @@ class UIControls:
         # Close the dialog
         self._close_split_dialog()
         
+    def _player_armies_at(self, x: int, y: int) -> List[Army]:
+        """
+        The current player's armies at (x, y)
+        
+        Reused until the position, turn or board changes; splits, merges and
+        moves all bump the board revision, so they invalidate it too
+        """
+        game_state = self.game_state
+        key = (x, y, game_state.current_player_index, game_state.turn_number, game_state.board.revision)
+        if key == self._parm_cache_key:
+            return self._parm_cache_val
+            
+        player_id = game_state.get_current_player().id
+        self._parm_cache_val = [a for a in game_state.board.get_armies_at(x, y) if a.player_id == player_id]
+        self._parm_cache_key = key
+        return self._parm_cache_val
+        
     def _handle_merge(self):
         """Handle merging of armies"""
         # Check if an army is selected
@@ -404,18 +553,13 @@ class UIControls:
             return
             
         x, y = self.renderer.selected_position
-        armies = self.game_state.board.get_armies_at(x, y)
-        current_player = self.game_state.get_current_player()
-        
-        # Filter for current player's armies
-        player_armies = [a for a in armies if a.player_id == current_player.id]
+        player_armies = self._player_armies_at(x, y)
         if not player_armies or len(player_armies) < 2:
             return
             
         # Merge all armies into the first one
         primary_army = player_armies[0]
-        for i in range(1, len(player_armies)):
-            self.game_state.merge_armies(primary_army, player_armies[i])
+        self.game_state.merge_armies_many(primary_army, player_armies[1:])
             
         # Update selection
         self.renderer.select_army(primary_army)
@@ -427,16 +571,12 @@ class UIControls:
             return
             
         x, y = self.renderer.selected_position
-        armies = self.game_state.board.get_armies_at(x, y)
-        current_player = self.game_state.get_current_player()
-        
-        # Filter for current player's armies
-        player_armies = [a for a in armies if a.player_id == current_player.id]
+        player_armies = self._player_armies_at(x, y)
         if not player_armies:
             return
             
         # Check if army is at headquarters
-        hq_x, hq_y = current_player.headquarters_position
+        hq_x, hq_y = self.game_state.get_current_player().headquarters_position
         if x != hq_x or y != hq_y:
             return
             
@@ -445,45 +585,82 @@ class UIControls:
             self.game_state.retreat_army(army)
             
         # Clear selection
-        self.renderer.selected_position = None
-        self.renderer.highlighted_positions.clear()
+        self.renderer.clear_selection()
 
     def update(self, time_delta: float):
         """Update UI controls"""
-        # Update button states based on game state
+        # Apply slider label changes once per frame, however many events arrived
+        if self._pending_strength is not None or self._pending_food is not None:
+            self._apply_pending_split_labels()
+            
+        # Update button states based on game state, at UI rate rather than frame rate
+        self._update_accum += time_delta
+        if self._update_accum < self._update_interval:
+            return
+        self._update_accum = 0.0
+        
+        seen_state = (self.game_state.board.revision, self.game_state.game_over)
+        if not self._controls_dirty and seen_state == self._seen_state:
+            return
+        self._controls_dirty = False
+        self._seen_state = seen_state
         self._update_button_states()
         
     def _update_button_states(self):
         """Update button states based on current game state"""
-        # Disable controls if game is over
-        game_over = self.game_state.game_over
-        self.end_turn_button.disable() if game_over else self.end_turn_button.enable()
+        game_state = self.game_state
+        
+        # Once the game is over every control stays disabled until a new game
+        if game_state.game_over:
+            if not self._game_over_applied:
+                for button in (self.end_turn_button, self.split_button, self.merge_button, self.retreat_button):
+                    self._set_enabled(button, False)
+                self._game_over_applied = True
+                self._btn_state_key = None
+            return
+        self._game_over_applied = False
+        
+        # Nothing to do unless the selection, turn or armies have changed
+        key = (self.renderer.selected_position, game_state.current_player_index,
+               game_state.turn_number, game_state.board.revision)
+        if key == self._btn_state_key:
+            return
+        self._btn_state_key = key
+        
+        self._set_enabled(self.end_turn_button, True)
         
         # Get selection info
         has_selection = self.renderer.selected_position is not None
         
         if has_selection:
             x, y = self.renderer.selected_position
-            armies = self.game_state.board.get_armies_at(x, y)
             current_player = self.game_state.get_current_player()
-            player_armies = [a for a in armies if a.player_id == current_player.id]
+            player_armies = self._player_armies_at(x, y)
             
             # Enable/disable Split button
             can_split = (len(player_armies) > 0 and 
                         player_armies[0].can_split() and 
                         len(self.game_state.board.get_adjacent_positions(x, y)) > 0)
-            self.split_button.enable() if can_split and not game_over else self.split_button.disable()
+            self._set_enabled(self.split_button, can_split)
             
             # Enable/disable Merge button
             can_merge = len(player_armies) > 1
-            self.merge_button.enable() if can_merge and not game_over else self.merge_button.disable()
+            self._set_enabled(self.merge_button, can_merge)
             
             # Enable/disable Retreat button
             hq_x, hq_y = current_player.headquarters_position if current_player else (-1, -1)
             can_retreat = len(player_armies) > 0 and x == hq_x and y == hq_y
-            self.retreat_button.enable() if can_retreat and not game_over else self.retreat_button.disable()
+            self._set_enabled(self.retreat_button, can_retreat)
         else:
             # No selection, disable all army controls
-            self.split_button.disable()
-            self.merge_button.disable()
-            self.retreat_button.disable()
+            self._set_enabled(self.split_button, False)
+            self._set_enabled(self.merge_button, False)
+            self._set_enabled(self.retreat_button, False)
+            
+    def _set_enabled(self, button: UIButton, want: bool):
+        """Enable or disable a button, skipping the rebuild if it is already in that state"""
+        key = id(button)
+        if self._btn_enabled[key] is want:
+            return
+        button.enable() if want else button.disable()
+        self._btn_enabled[key] = want
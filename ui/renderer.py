@@ -3,16 +3,63 @@ Renderer for Strategic Conquest
 Handles the visual display of the game state
 """
 
+import numpy as np
 import pygame
-import yaml
-from typing import Dict, Tuple, List, Optional, Set
+from collections import namedtuple
+from functools import lru_cache, partial
+from typing import Callable, Dict, Tuple, List, Optional, Set
 import math
 
+from game.config import CONFIG_PATH, load_config
 from game.state import GameState
 from game.board import TileType
 from game.army import Army
 
 
+# Colours from the config, converted to the tuples pygame draws with
+_Palette = namedtuple('_Palette', ['tiles', 'tiles_fog', 'players', 'selection', 'highlight'])
+
+
+@lru_cache(maxsize=None)
+def _load_palette(path: str = CONFIG_PATH) -> _Palette:
+    """Parse the configured colours once per config file"""
+    colors = load_config(path)['colors']
+    tiles = {tile_type: tuple(colors['tiles'][tile_type.name.lower()]) for tile_type in TileType}
+    return _Palette(
+        tiles=tiles,
+        tiles_fog={tile_type: tuple(c // 2 for c in color) for tile_type, color in tiles.items()},
+        players=tuple(tuple(color) for color in colors['players']),
+        selection=tuple(colors['ui']['selection']),
+        highlight=tuple(colors['ui']['highlight'])
+    )
+
+
+# Symbol drawn on each tile type; plain tiles have none
+_TILE_SYMBOL = {
+    TileType.HEADQUARTERS: "HQ",
+    TileType.FORT: "F",
+    TileType.FOREST: "🌲",
+    TileType.VALLEY: "V",
+    TileType.RIVER: "~",
+    TileType.MOUNTAIN: "▲",
+}
+
+
+@lru_cache(maxsize=None)
+def _reach_offsets(distance: int) -> Tuple[Tuple[int, int], ...]:
+    """Offsets within a Manhattan distance of a tile, excluding the tile itself"""
+    return tuple(
+        (dx, dy)
+        for dx in range(-distance, distance + 1)
+        for dy in range(-(distance - abs(dx)), distance - abs(dx) + 1)
+        if dx or dy
+    )
+
+
+# Most rendered text surfaces kept before the cache is emptied
+_TEXT_CACHE_LIMIT = 1024
+
+
 class GameRenderer:
     """Renders the game state to the screen"""
     
@@ -20,9 +67,8 @@ class GameRenderer:
         self.screen = screen
         self.game_state = game_state
         
-        # Load configuration
-        with open('config.yaml', 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Load configuration (parsed once and shared with the game state)
+        self.config = load_config()
             
         # Calculate tile size based on screen and board dimensions
         screen_width, screen_height = screen.get_size()
@@ -36,35 +82,83 @@ class GameRenderer:
         # Calculate offsets to center the board
         self.offset_x = (screen_width - self.board_pixel_width) // 2
         self.offset_y = (screen_height - self.board_pixel_height) // 2
+        self._layout_tiles()
         
         # UI state
-        self.selected_position: Optional[Tuple[int, int]] = None
+        self.selection_listeners: List[Callable[[], None]] = []  # Called when the selection changes
+        self._selected_position: Optional[Tuple[int, int]] = None
         self.highlighted_positions: Set[Tuple[int, int]] = set()
-        self.visible_positions: Dict[int, Set[Tuple[int, int]]] = {}  # Player ID -> visible positions
+        self._highlight_key = None  # (selection, player, board revision) the highlights were built for
+        self.visible_positions: Dict[int, np.ndarray] = {}  # Player ID -> (height, width) visibility mask
         
         # Load colors
-        self.tile_colors = {
-            TileType.PLAIN: self._parse_color(self.config['colors']['tiles']['plain']),
-            TileType.HEADQUARTERS: self._parse_color(self.config['colors']['tiles']['headquarters']),
-            TileType.FORT: self._parse_color(self.config['colors']['tiles']['fort']),
-            TileType.FOREST: self._parse_color(self.config['colors']['tiles']['forest']),
-            TileType.VALLEY: self._parse_color(self.config['colors']['tiles']['valley']),
-            TileType.RIVER: self._parse_color(self.config['colors']['tiles']['river']),
-            TileType.MOUNTAIN: self._parse_color(self.config['colors']['tiles']['mountain'])
-        }
-        
-        self.player_colors = [self._parse_color(color) for color in self.config['colors']['players']]
-        self.selection_color = self._parse_color(self.config['colors']['ui']['selection'])
-        self.highlight_color = self._parse_color(self.config['colors']['ui']['highlight'])
+        palette = _load_palette()
+        self.tile_colors = palette.tiles
+        self.tile_colors_fog = palette.tiles_fog  # Tiles hidden by fog of war, at half brightness
+        self.player_colors = palette.players
+        self.selection_color = palette.selection
+        self.highlight_color = palette.highlight
         
         # Initialize fonts
         pygame.font.init()
         self.font = pygame.font.SysFont('Arial', 12)
         self.large_font = pygame.font.SysFont('Arial', 16, bold=True)
         
-    def _parse_color(self, color_list: List[int]) -> Tuple[int, int, int]:
-        """Convert a color list to a tuple"""
-        return tuple(color_list)
+        # Static terrain layers, redrawn only when the board's tiles change: the
+        # whole board fogged, and each tile lit as a subsurface of the lit board
+        self._board_bg: Optional[pygame.Surface] = None
+        self._board_fog_bg: Optional[pygame.Surface] = None
+        self._lit_tiles: List[pygame.Surface] = []
+        self._board_bg_revision = -1
+        
+        # The composed board (terrain, fog and highlights), redrawn only when the
+        # visibility, selection or highlights it was drawn for change
+        self._board_frame = pygame.Surface((self.board_pixel_width, self.board_pixel_height))
+        self._board_frame_key = None
+        self._frame_origins: List[Tuple[int, int]] = [
+            (x - self.offset_x, y - self.offset_y) for x, y in self._tile_origins
+        ]
+        self._visible_key = None  # (player, board revision, terrain revision) of the cached mask
+        self._symbol_cache: Dict[TileType, pygame.Surface] = {}
+        
+        # Rendered text keyed by (font, text, colour), so unchanged labels such
+        # as army strengths and scores are not rasterized again every frame
+        self._text_cache: Dict[Tuple[pygame.font.Font, str, Tuple[int, ...]], pygame.Surface] = {}
+        
+        # Per-tile overlays outlining the selected tile and the tiles it can move to
+        self._selection_tile = self._outline_tile(self.selection_color, 3)
+        self._highlight_tile = self._outline_tile(self.highlight_color, 2)
+        
+        # Batched blitting: pygame-ce's fblits where available, otherwise blits
+        fblits = getattr(self._board_frame, 'fblits', None)
+        self._blit_many = fblits if fblits is not None else partial(self._board_frame.blits, doreturn=False)
+        
+    def _layout_tiles(self):
+        """
+        Precompute each tile's screen position from the board offsets
+        
+        _tile_origins holds the top-left corner and _tile_centers the centre of
+        every tile, indexed y * width + x; call again if the offsets change
+        """
+        board = self.game_state.board
+        tile_size = self.tile_size
+        xs = self.offset_x + np.arange(board.width) * tile_size
+        ys = self.offset_y + np.arange(board.height) * tile_size
+        self._tile_origins: List[Tuple[int, int]] = [(px, py) for py in ys.tolist() for px in xs.tolist()]
+        half = tile_size // 2
+        self._tile_centers: List[Tuple[int, int]] = [(px + half, py + half) for px, py in self._tile_origins]
+        
+    @property
+    def selected_position(self) -> Optional[Tuple[int, int]]:
+        """Board position of the current selection, if any"""
+        return self._selected_position
+        
+    @selected_position.setter
+    def selected_position(self, position: Optional[Tuple[int, int]]):
+        if position != self._selected_position:
+            self._selected_position = position
+            for listener in self.selection_listeners:
+                listener()
         
     def render(self):
         """Render the entire game state"""
@@ -74,110 +168,131 @@ class GameRenderer:
         
     def _render_board(self):
         """Render the game board"""
-        # Calculate visibility for current player
-        current_player = self.game_state.get_current_player()
-        self.visible_positions[current_player.id] = current_player.calculate_visibility(self.game_state.board, self.config)
+        board = self.game_state.board
         
-        # Draw tiles
-        for y in range(self.game_state.board.height):
-            for x in range(self.game_state.board.width):
-                # Get tile type
-                tile = self.game_state.board.get_tile(x, y)
-                
-                # Determine visibility
-                is_visible = (x, y) in self.visible_positions[current_player.id]
-                fog_factor = 1.0 if is_visible else 0.5
-                
-                # Get base color for tile type
-                color = self.tile_colors[tile.type]
-                
-                # Apply fog of war
-                if not is_visible:
-                    color = tuple(int(c * fog_factor) for c in color)
-                
-                # Draw tile
-                rect = pygame.Rect(
-                    self.offset_x + x * self.tile_size,
-                    self.offset_y + y * self.tile_size,
-                    self.tile_size,
-                    self.tile_size
-                )
-                pygame.draw.rect(self.screen, color, rect)
-                pygame.draw.rect(self.screen, (0, 0, 0), rect, 1)  # Border
-                
-                # Draw selection highlight
-                if (x, y) == self.selected_position:
-                    pygame.draw.rect(self.screen, self.selection_color, rect, 3)
-                    
-                # Draw movement highlights
-                if (x, y) in self.highlighted_positions:
-                    pygame.draw.rect(self.screen, self.highlight_color, rect, 2)
-                    
-                # Draw tile type indicator
-                if tile.type != TileType.PLAIN:
-                    symbol = self._get_tile_symbol(tile.type)
-                    text = self.font.render(symbol, True, (0, 0, 0))
-                    text_rect = text.get_rect(center=(
-                        self.offset_x + x * self.tile_size + self.tile_size // 2,
-                        self.offset_y + y * self.tile_size + self.tile_size // 2
-                    ))
-                    self.screen.blit(text, text_rect)
+        # Calculate visibility for current player, which only changes with the
+        # armies on the board and the terrain they stand on
+        current_player = self.game_state.get_current_player()
+        visible_key = (current_player.id, board.revision, board.terrain_revision)
+        if visible_key != self._visible_key:
+            self._visible_key = visible_key
+            self.visible_positions[current_player.id] = current_player.visibility_mask(board, self.config)
+            
+        # Static terrain comes from cached surfaces, rebuilt only when tiles change
+        if self._board_bg is None or self._board_bg_revision != board.terrain_revision:
+            self._build_board_background()
+            
+        # Most frames change nothing on the board, so reuse the last composition
+        frame_key = (visible_key, self.selected_position, self._highlight_key)
+        if frame_key != self._board_frame_key:
+            self._board_frame_key = frame_key
+            self._compose_board_frame(self.visible_positions[current_player.id])
+        self.screen.blit(self._board_frame, (self.offset_x, self.offset_y))
+        
+    def _compose_board_frame(self, visible: np.ndarray):
+        """Draw the fogged terrain, lit tiles and highlights onto the board frame"""
+        # Layers are blitted one call per layer rather than one call per tile
+        origins, width = self._frame_origins, self.game_state.board.width
+        blit_many = self._blit_many
+        
+        # Apply fog of war: start from the fogged board and light the visible tiles
+        self._board_frame.blit(self._board_fog_bg, (0, 0))
+        lit_tiles = self._lit_tiles
+        blit_many([(lit_tiles[i], origins[i]) for i in np.flatnonzero(visible).tolist()])
+        
+        # Draw selection highlight
+        if self.selected_position is not None:
+            x, y = self.selected_position
+            self._board_frame.blit(self._selection_tile, origins[y * width + x])
+            
+        # Draw movement highlights
+        highlight_tile = self._highlight_tile
+        blit_many([
+            (highlight_tile, origins[y * width + x])
+            for x, y in self.highlighted_positions
+        ])
+        
+    def _outline_tile(self, color: Tuple[int, int, int], width: int) -> pygame.Surface:
+        """Transparent tile-sized surface with a coloured border"""
+        surface = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
+        pygame.draw.rect(surface, color, surface.get_rect(), width)
+        return surface
+        
+    def _build_board_background(self):
+        """Draw every tile's colour, border and symbol onto the cached lit and fogged boards"""
+        board = self.game_state.board
+        tile_size = self.tile_size
+        lit = pygame.Surface((self.board_pixel_width, self.board_pixel_height))
+        fogged = pygame.Surface((self.board_pixel_width, self.board_pixel_height))
+        lit_tiles = []
+        
+        for y in range(board.height):
+            for x in range(board.width):
+                tile_type = board.get_tile(x, y).type
+                rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+                for surface, colors in ((lit, self.tile_colors), (fogged, self.tile_colors_fog)):
+                    pygame.draw.rect(surface, colors[tile_type], rect)
+                    pygame.draw.rect(surface, (0, 0, 0), rect, 1)  # Border
                     
+                    # Draw tile type indicator
+                    if tile_type in _TILE_SYMBOL:
+                        text = self._get_symbol_surface(tile_type)
+                        surface.blit(text, text.get_rect(center=rect.center))
+                lit_tiles.append(lit.subsurface(rect))
+                
+        self._board_bg = lit
+        self._board_fog_bg = fogged
+        self._lit_tiles = lit_tiles
+        self._board_bg_revision = board.terrain_revision
+        
+    def _render_text(self, font: pygame.font.Font, text: str, color: Tuple[int, ...]) -> pygame.Surface:
+        """Rendered text, reused for as long as the same text is drawn again"""
+        key = (font, text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            # Bound the cache; values like food counts drift over a long game
+            if len(self._text_cache) >= _TEXT_CACHE_LIMIT:
+                self._text_cache.clear()
+            surface = font.render(text, True, color)
+            self._text_cache[key] = surface
+        return surface
+        
+    def _get_symbol_surface(self, tile_type: TileType) -> pygame.Surface:
+        """Rendered symbol for a tile type, rasterized once per type"""
+        text = self._symbol_cache.get(tile_type)
+        if text is None:
+            text = self._render_text(self.font, self._get_tile_symbol(tile_type), (0, 0, 0))
+            self._symbol_cache[tile_type] = text
+        return text
+        
     def _get_tile_symbol(self, tile_type: TileType) -> str:
         """Get a symbol to represent a tile type"""
-        if tile_type == TileType.HEADQUARTERS:
-            return "HQ"
-        elif tile_type == TileType.FORT:
-            return "F"
-        elif tile_type == TileType.FOREST:
-            return "🌲"
-        elif tile_type == TileType.VALLEY:
-            return "V"
-        elif tile_type == TileType.RIVER:
-            return "~"
-        elif tile_type == TileType.MOUNTAIN:
-            return "▲"
-        return ""
+        return _TILE_SYMBOL.get(tile_type, "")
         
     def _render_armies(self):
         """Render all armies on the board"""
         current_player = self.game_state.get_current_player()
         
-        for (x, y), armies in self.game_state.board.armies_by_position.items():
-            # Check if position is visible to current player
-            is_visible = (x, y) in self.visible_positions[current_player.id]
-            
-            if is_visible or any(army.player_id == current_player.id for army in armies):
-                self._render_armies_at_position(x, y, armies)
+        # Visibility indexed by flat board position, like armies_by_position
+        visible = self.visible_positions[current_player.id].ravel()
+        
+        # Per-player totals for each occupied tile, cached by the board
+        board = self.game_state.board
+        player_id = current_player.id
+        for pos, by_player in board.army_totals.items():
+            # Draw tiles visible to the current player, or holding its armies
+            if visible[pos] or player_id in by_player:
+                y, x = divmod(pos, board.width)
+                self._render_armies_at_position(x, y, by_player)
                 
-    def _render_armies_at_position(self, x: int, y: int, armies: List[Army]):
-        """Render armies at a specific position"""
-        # Group armies by player
-        armies_by_player = {}
-        for army in armies:
-            if army.player_id not in armies_by_player:
-                armies_by_player[army.player_id] = []
-            armies_by_player[army.player_id].append(army)
-            
-        # Calculate total strength per player
-        strength_by_player = {}
-        has_general_by_player = {}
-        for player_id, player_armies in armies_by_player.items():
-            strength_by_player[player_id] = sum(army.strength for army in player_armies)
-            has_general_by_player[player_id] = any(army.has_general for army in player_armies)
-            
-        # Get number of players at this position
-        num_players = len(armies_by_player)
-        
+    def _render_armies_at_position(self, x: int, y: int, by_player: Dict[int, Tuple[int, bool]]):
+        """Render the armies at a position from each player's (strength, has_general) totals"""
         # Determine how to arrange the armies
-        if num_players == 1:
+        if len(by_player) == 1:
             # Single player - draw one circle
-            player_id = list(armies_by_player.keys())[0]
-            strength = strength_by_player[player_id]
-            has_general = has_general_by_player[player_id]
+            (player_id, (strength, has_general)), = by_player.items()
             
-            center_x = self.offset_x + x * self.tile_size + self.tile_size // 2
-            center_y = self.offset_y + y * self.tile_size + self.tile_size // 2
+            center_x, center_y = self._tile_centers[y * self.game_state.board.width + x]
             
             self._draw_army(center_x, center_y, player_id, strength, has_general)
         else:
@@ -189,16 +304,14 @@ class GameRenderer:
                 (0.75, 0.75)   # Bottom-right
             ]
             
-            for i, (player_id, player_armies) in enumerate(armies_by_player.items()):
+            origin_x, origin_y = self._tile_origins[y * self.game_state.board.width + x]
+            for i, (player_id, (strength, has_general)) in enumerate(by_player.items()):
                 if i >= len(positions):
                     break
                     
                 rel_x, rel_y = positions[i]
-                center_x = self.offset_x + x * self.tile_size + int(rel_x * self.tile_size)
-                center_y = self.offset_y + y * self.tile_size + int(rel_y * self.tile_size)
-                
-                strength = strength_by_player[player_id]
-                has_general = has_general_by_player[player_id]
+                center_x = origin_x + int(rel_x * self.tile_size)
+                center_y = origin_y + int(rel_y * self.tile_size)
                 
                 self._draw_army(center_x, center_y, player_id, strength, has_general, size_factor=0.7)
                 
@@ -216,7 +329,7 @@ class GameRenderer:
         pygame.draw.circle(self.screen, (0, 0, 0), (center_x, center_y), radius, 1)
         
         # Draw strength number
-        text = self.font.render(str(strength), True, (0, 0, 0))
+        text = self._render_text(self.font, str(strength), (0, 0, 0))
         text_rect = text.get_rect(center=(center_x, center_y))
         self.screen.blit(text, text_rect)
         
@@ -243,8 +356,8 @@ class GameRenderer:
         turn_text = f"Turn {self.game_state.turn_number}"
         player_text = f"Player {current_player.id + 1}"
         
-        turn_surface = self.large_font.render(turn_text, True, (255, 255, 255))
-        player_surface = self.large_font.render(player_text, True, player_color)
+        turn_surface = self._render_text(self.large_font, turn_text, (255, 255, 255))
+        player_surface = self._render_text(self.large_font, player_text, player_color)
         
         self.screen.blit(turn_surface, (10, 10))
         self.screen.blit(player_surface, (10, 40))
@@ -254,7 +367,7 @@ class GameRenderer:
         for player in self.game_state.players:
             color = self.player_colors[player.id % len(self.player_colors)]
             score_text = f"Player {player.id + 1}: {player.score} pts"
-            score_surface = self.font.render(score_text, True, color)
+            score_surface = self._render_text(self.font, score_text, color)
             self.screen.blit(score_surface, (10, score_y))
             score_y += 20
             
@@ -266,8 +379,8 @@ class GameRenderer:
                 winner_color = self.player_colors[winner_id % len(self.player_colors)]
                 winner_text = f"Player {winner_id + 1} wins!"
                 
-                game_over_surface = self.large_font.render(game_over_text, True, (255, 255, 255))
-                winner_surface = self.large_font.render(winner_text, True, winner_color)
+                game_over_surface = self._render_text(self.large_font, game_over_text, (255, 255, 255))
+                winner_surface = self._render_text(self.large_font, winner_text, winner_color)
                 
                 screen_width, _ = self.screen.get_size()
                 game_over_rect = game_over_surface.get_rect(center=(screen_width // 2, 30))
@@ -299,12 +412,12 @@ class GameRenderer:
         
         # Draw position
         pos_text = f"Position: ({x}, {y})"
-        pos_surface = self.font.render(pos_text, True, (255, 255, 255))
+        pos_surface = self._render_text(self.font, pos_text, (255, 255, 255))
         self.screen.blit(pos_surface, (info_x + 10, info_y + 10))
         
         # Draw tile type
         tile_text = f"Terrain: {tile.type.name.capitalize()}"
-        tile_surface = self.font.render(tile_text, True, (255, 255, 255))
+        tile_surface = self._render_text(self.font, tile_text, (255, 255, 255))
         self.screen.blit(tile_surface, (info_x + 10, info_y + 30))
         
         # Draw armies info
@@ -318,10 +431,10 @@ class GameRenderer:
                 general_text = "Has General" if army.has_general else "No General"
                 player_text = f"Player {army.player_id + 1}"
                 
-                strength_surface = self.font.render(strength_text, True, player_color)
-                food_surface = self.font.render(food_text, True, player_color)
-                general_surface = self.font.render(general_text, True, player_color)
-                player_surface = self.font.render(player_text, True, player_color)
+                strength_surface = self._render_text(self.font, strength_text, player_color)
+                food_surface = self._render_text(self.font, food_text, player_color)
+                general_surface = self._render_text(self.font, general_text, player_color)
+                player_surface = self._render_text(self.font, player_text, player_color)
                 
                 self.screen.blit(player_surface, (info_x + 10, army_y))
                 self.screen.blit(strength_surface, (info_x + 10, army_y + 15))
@@ -331,7 +444,7 @@ class GameRenderer:
                 army_y += 60
         else:
             no_army_text = "No armies present"
-            no_army_surface = self.font.render(no_army_text, True, (255, 255, 255))
+            no_army_surface = self._render_text(self.font, no_army_text, (255, 255, 255))
             self.screen.blit(no_army_surface, (info_x + 10, info_y + 50))
             
     def handle_click(self, mouse_pos: Tuple[int, int]):
@@ -362,8 +475,7 @@ class GameRenderer:
                 # Try to move the army
                 if selected_x == board_x and selected_y == board_y:
                     # Clicked on the same tile, deselect
-                    self.selected_position = None
-                    self.highlighted_positions.clear()
+                    self.clear_selection()
                 else:
                     # Try to move to the new position
                     army_to_move = player_selected_armies[0]  # Just move the first army for now
@@ -389,13 +501,19 @@ class GameRenderer:
             
     def _update_movement_highlights(self):
         """Update which tiles are highlighted for movement"""
+        # Highlights only change with the selection, the player or the armies
+        board = self.game_state.board
+        key = (self.selected_position, self.game_state.current_player_index, board.revision)
+        if key == self._highlight_key:
+            return
+        self._highlight_key = key
         self.highlighted_positions.clear()
         
         if self.selected_position is None:
             return
             
         x, y = self.selected_position
-        armies = self.game_state.board.get_armies_at(x, y)
+        armies = board.get_armies_at(x, y)
         current_player = self.game_state.get_current_player()
         
         # Only highlight for current player's armies
@@ -407,16 +525,21 @@ class GameRenderer:
         army = player_armies[0]
         movement_range = self.game_state._calculate_movement_range(army)
         
-        # Highlight tiles within movement range
-        for dx in range(-movement_range, movement_range + 1):
-            for dy in range(-movement_range, movement_range + 1):
-                # Manhattan distance
-                distance = abs(dx) + abs(dy)
-                if 0 < distance <= movement_range:
-                    highlight_x, highlight_y = x + dx, y + dy
-                    if self.game_state.board.is_valid_position(highlight_x, highlight_y):
-                        self.highlighted_positions.add((highlight_x, highlight_y))
-                        
+        # Highlight tiles within movement range, other than the army's own
+        width, height = board.width, board.height
+        self.highlighted_positions.update(
+            (x + dx, y + dy) for dx, dy in _reach_offsets(movement_range)
+            if 0 <= x + dx < width and 0 <= y + dy < height
+        )
+        
+    def clear_selection(self):
+        """Drop the current selection and its movement highlights"""
+        if self._selected_position is None and not self.highlighted_positions:
+            return
+        self.selected_position = None
+        self.highlighted_positions.clear()
+        self._highlight_key = None
+        
     def select_army(self, army: Army):
         """Select a specific army"""
         self.selected_position = (army.x, army.y)
@@ -0,0 +1,20 @@
+"""
+Optional Numba acceleration for Strategic Conquest
+
+Kernels are written against NumPy arrays and decorated with njit. When
+Numba is not installed the decorator is a no-op and the kernels run as
+plain Python.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
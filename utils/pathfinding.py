@@ -2,11 +2,56 @@
 Pathfinding utilities for Strategic Conquest
 """
 
-import heapq
 from typing import List, Dict, Tuple, Set, Optional, Callable
-import networkx as nx
+import numpy as np
 
-from game.board import Board, TileType
+from game.board import Board, TileType, MOVE_COST_LUT
+from utils.jit import njit
+
+
+@njit(cache=True, boundscheck=False)
+def _movement_range_mask(start, movement_points, nbr_indptr, nbr_idx, move_cost, reachable):
+    """
+    Mark every tile reachable from flat index start within movement_points
+    
+    Dijkstra over the board's CSR adjacency with a bucket queue: tile costs are
+    small integers, so bucket d holds the tiles first reached at cost d, kept
+    as linked lists in flat arrays. Each edge is relaxed at most once, which
+    bounds the number of queue entries
+    """
+    dist = np.full(reachable.shape[0], movement_points + 1, dtype=np.int32)
+    head = np.full(movement_points + 1, -1, dtype=np.int32)
+    entry_tile = np.empty(nbr_idx.shape[0] + 1, dtype=np.int32)
+    entry_next = np.empty(nbr_idx.shape[0] + 1, dtype=np.int32)
+    
+    dist[start] = 0
+    entry_tile[0] = start
+    entry_next[0] = -1
+    head[0] = 0
+    used = 1
+    
+    for d in range(movement_points + 1):
+        entry = head[d]
+        while entry != -1:
+            u = entry_tile[entry]
+            entry = entry_next[entry]
+            
+            # Skip entries superseded by a cheaper route
+            if dist[u] != d:
+                continue
+            reachable[u] = True
+            
+            for k in range(nbr_indptr[u], nbr_indptr[u + 1]):
+                v = nbr_idx[k]
+                cost = d + int(move_cost[v])
+                if cost < dist[v]:
+                    dist[v] = cost
+                    entry_tile[used] = v
+                    entry_next[used] = head[cost]
+                    head[cost] = used
+                    used += 1
+                    
+    reachable[start] = False
 
 
 def calculate_movement_range(board: Board, start_x: int, start_y: int, 
@@ -24,55 +69,48 @@ def calculate_movement_range(board: Board, start_x: int, start_y: int,
     Returns:
         Set of (x, y) positions that can be reached
     """
-    # Initialize data structures
-    reachable = set()
-    visited = set()
-    queue = [(0, start_x, start_y)]  # (cost, x, y)
-    
-    while queue:
-        cost, x, y = heapq.heappop(queue)
+    if movement_points < 0 or not board.is_valid_position(start_x, start_y):
+        return set()
         
-        # Skip if already visited or out of range
-        if (x, y) in visited or cost > movement_points:
-            continue
-            
-        # Mark as visited and reachable
-        visited.add((x, y))
-        if (x, y) != (start_x, start_y):
-            reachable.add((x, y))
-            
-        # Check adjacent tiles
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            
-            if not board.is_valid_position(nx, ny):
-                continue
-                
-            # Skip if already visited
-            if (nx, ny) in visited:
-                continue
-                
-            # Calculate movement cost
-            tile = board.get_tile(nx, ny)
-            movement_cost = get_movement_cost(tile.type)
-            
-            # Add to queue if within range
-            if cost + movement_cost <= movement_points:
-                heapq.heappush(queue, (cost + movement_cost, nx, ny))
-                
-    return reachable
+    width = board.width
+    reachable = np.zeros(width * board.height, dtype=np.bool_)
+    _movement_range_mask(start_y * width + start_x, int(movement_points),
+                         board._nbr_indptr, board._nbr_idx, board.move_cost, reachable)
+    
+    ys, xs = np.divmod(np.flatnonzero(reachable), width)
+    return set(zip(xs.tolist(), ys.tolist()))
 
 
 def get_movement_cost(tile_type: TileType) -> float:
     """Get movement cost for a tile type"""
-    if tile_type == TileType.PLAIN or tile_type == TileType.HEADQUARTERS or tile_type == TileType.FORT:
-        return 1.0
-    elif tile_type == TileType.FOREST or tile_type == TileType.RIVER or tile_type == TileType.MOUNTAIN:
-        return 2.0
-    elif tile_type == TileType.VALLEY:
-        return 1.0
-    else:
-        return 1.0
+    return float(MOVE_COST_LUT[tile_type.value])
+
+
+@njit(cache=True, boundscheck=False)
+def _connected(start, target, nbr_indptr, nbr_idx, occupied):
+    """Breadth-first search from start to target through occupied tiles only"""
+    if start == target:
+        return True
+        
+    seen = np.zeros(occupied.shape[0], dtype=np.uint8)
+    queue = np.empty(occupied.shape[0], dtype=np.int32)
+    seen[start] = 1
+    queue[0] = start
+    head, tail = 0, 1
+    
+    while head < tail:
+        u = queue[head]
+        head += 1
+        for k in range(nbr_indptr[u], nbr_indptr[u + 1]):
+            v = nbr_idx[k]
+            if occupied[v] and not seen[v]:
+                if v == target:
+                    return True
+                seen[v] = 1
+                queue[tail] = v
+                tail += 1
+                
+    return False
 
 
 def find_supply_chain(board: Board, start_x: int, start_y: int, 
@@ -90,36 +128,23 @@ def find_supply_chain(board: Board, start_x: int, start_y: int,
     Returns:
         True if a supply chain exists, False otherwise
     """
-    # Create a graph where nodes are positions with friendly armies
-    G = nx.Graph()
-    
-    # Add nodes for all positions with friendly armies
-    for pos, armies in board.armies_by_position.items():
-        x, y = pos
-        friendly_armies = [a for a in armies if a.player_id == player_id]
-        if friendly_armies:
-            G.add_node(pos)
-            
-    # Add edges between adjacent positions
-    for pos in G.nodes:
-        x, y = pos
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            adj_pos = (nx, ny)
-            
-            if adj_pos in G:
-                G.add_edge(pos, adj_pos)
-                
-    # Check if start and destination are in the graph
-    start_pos = (start_x, start_y)
-    dest_pos = (destination_x, destination_y)
-    
-    if start_pos not in G or dest_pos not in G:
+    if not (board.is_valid_position(start_x, start_y) and
+            board.is_valid_position(destination_x, destination_y)):
         return False
         
-    # Check if there's a path from start to destination
-    try:
-        path = nx.shortest_path(G, start_pos, dest_pos)
-        return len(path) > 0
-    except nx.NetworkXNoPath:
+    # Mark every tile holding at least one friendly army
+    width = board.width
+    occupied = np.zeros(width * board.height, dtype=np.uint8)
+    for key, armies in board.armies_by_position.items():
+        for army in armies:
+            if army.player_id == player_id:
+                occupied[key] = 1
+                break
+                
+    # The chain must start and end on friendly tiles
+    start = start_y * width + start_x
+    destination = destination_y * width + destination_x
+    if not occupied[start] or not occupied[destination]:
         return False
+        
+    return bool(_connected(start, destination, board._nbr_indptr, board._nbr_idx, occupied))
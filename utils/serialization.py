@@ -2,14 +2,76 @@
 Serialization utilities for Strategic Conquest
 """
 
+import base64
 import json
-import yaml
 from typing import Dict, Any, List, Tuple
 import os
+import numpy as np
 
 from game.state import GameState
 from game.board import Board, Tile, TileType
-from game.army import Army
+from game.army import Army, MOVED, FOUGHT
+
+
+# orjson when installed: several times faster than json, and writes bytes
+try:
+    import orjson
+    
+    def _json_dumps(data: Dict[str, Any]) -> bytes:
+        """Encode save data as indented JSON"""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(data: Dict[str, Any]) -> bytes:
+        """Encode save data as indented JSON"""
+        # Byte for byte what orjson writes, so saves don't depend on it being installed
+        return json.dumps(data, indent=2, ensure_ascii=False).encode()
+        
+    _json_loads = json.loads
+
+# Tile codes by type name, for saves that list tiles by name
+_TILE_CODES = {tile_type.name: tile_type.value for tile_type in TileType}
+
+# Save format for each file extension; anything else is saved as JSON
+_YAML_EXTENSIONS = ('.yaml', '.yml')
+
+
+def _encode_grid(grid: np.ndarray) -> str:
+    """Pack an int8 board grid into base64 text"""
+    return base64.b64encode(np.ascontiguousarray(grid, dtype=np.int8).tobytes()).decode('ascii')
+
+
+def _decode_grid(text: str, shape: Tuple[int, int]) -> np.ndarray:
+    """Unpack a board grid written by _encode_grid"""
+    return np.frombuffer(base64.b64decode(text), dtype=np.int8).reshape(shape)
+
+
+def _save_json(data: Dict[str, Any], filename: str):
+    """Write save data as JSON"""
+    with open(filename, 'wb') as f:
+        f.write(_json_dumps(data))
+
+
+def _load_json(filename: str) -> Dict[str, Any]:
+    """Read save data written by _save_json"""
+    with open(filename, 'rb') as f:
+        return _json_loads(f.read())
+
+
+def _save_yaml(data: Dict[str, Any], filename: str):
+    """Write save data as YAML, with libyaml's emitter when available"""
+    # Imported here so JSON-only callers never pay for loading PyYAML
+    import yaml
+    with open(filename, 'w') as f:
+        yaml.dump(data, f, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper), default_flow_style=False)
+
+
+def _load_yaml(filename: str) -> Dict[str, Any]:
+    """Read save data written by _save_yaml, with libyaml's parser when available"""
+    import yaml
+    with open(filename, 'r') as f:
+        return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
 
 
 def save_game(game_state: GameState, filename: str):
@@ -30,16 +92,8 @@ def save_game(game_state: GameState, filename: str):
         'board': {
             'width': game_state.board.width,
             'height': game_state.board.height,
-            'tiles': [
-                [
-                    {
-                        'type': tile.type.name,
-                        'player_id': tile.player_id
-                    }
-                    for tile in row
-                ]
-                for row in game_state.board.tiles
-            ]
+            'type_grid': _encode_grid(game_state.board.type_grid),
+            'owner_grid': _encode_grid(game_state.board.owner_grid)
         },
         
         'players': [
@@ -47,7 +101,7 @@ def save_game(game_state: GameState, filename: str):
                 'id': player.id,
                 'name': player.name,
                 'score': player.score,
-                'headquarters_position': player.headquarters_position,
+                'headquarters_position': list(player.headquarters_position),
                 'is_eliminated': player.is_eliminated,
                 'armies': [
                     {
@@ -67,14 +121,10 @@ def save_game(game_state: GameState, filename: str):
     }
     
     # Save to file
-    with open(filename, 'w') as f:
-        if filename.endswith('.json'):
-            json.dump(data, f, indent=4)
-        elif filename.endswith('.yaml') or filename.endswith('.yml'):
-            yaml.dump(data, f, default_flow_style=False)
-        else:
-            # Default to JSON
-            json.dump(data, f, indent=4)
+    if filename.endswith(_YAML_EXTENSIONS):
+        _save_yaml(data, filename)
+    else:
+        _save_json(data, filename)
 
 
 def load_game(filename: str) -> GameState:
@@ -88,41 +138,41 @@ def load_game(filename: str) -> GameState:
         Loaded GameState
     """
     # Load data from file
-    with open(filename, 'r') as f:
-        if filename.endswith('.json'):
-            data = json.load(f)
-        elif filename.endswith('.yaml') or filename.endswith('.yml'):
-            data = yaml.safe_load(f)
-        else:
-            # Default to JSON
-            data = json.load(f)
+    if filename.endswith(_YAML_EXTENSIONS):
+        data = _load_yaml(filename)
+    else:
+        data = _load_json(filename)
     
     # Create a new board
     board_data = data['board']
     board = Board(board_data['width'], board_data['height'])
     
-    # Clear the board
-    board._initialize_board()
-    
-    # Set up tiles
-    for y, row in enumerate(board_data['tiles']):
-        for x, tile_data in enumerate(row):
-            tile = board.get_tile(x, y)
-            tile.type = TileType[tile_data['type']]
-            tile.player_id = tile_data['player_id']
+    # Set up tiles, filling the board's grids in one assignment each
+    shape = board.type_grid.shape
+    if 'type_grid' in board_data:
+        board.type_grid[:] = _decode_grid(board_data['type_grid'], shape)
+        board.owner_grid[:] = _decode_grid(board_data['owner_grid'], shape)
+    else:
+        # Older saves list every tile by type name
+        tiles = [tile_data for row in board_data['tiles'] for tile_data in row]
+        board.type_grid[:] = np.fromiter(
+            (_TILE_CODES[tile_data['type']] for tile_data in tiles), dtype=np.int8, count=len(tiles)
+        ).reshape(shape)
+        board.owner_grid[:] = np.fromiter(
+            (-1 if tile_data['player_id'] is None else tile_data['player_id'] for tile_data in tiles),
+            dtype=np.int8, count=len(tiles)
+        ).reshape(shape)
+    board._terrain_changed()
     
-    # Create a new game state
-    game_state = GameState(board, len(data['players']))
+    # Create a game state around the loaded board, without setting up a new game
+    game_state = GameState(board, len(data['players']), setup=False)
     
     # Overwrite game state properties
     game_state.turn_number = data['turn_number']
     game_state.current_player_index = data['current_player_index']
     game_state.game_over = data['game_over']
     
-    # Clear existing players data
-    game_state.players = []
-    
-    # Set up players
+    # Fill in the players the game state created, by id
     for player_data in data['players']:
         player = game_state.players[player_data['id']]
         player.name = player_data['name']
@@ -130,24 +180,28 @@ def load_game(filename: str) -> GameState:
         player.headquarters_position = tuple(player_data['headquarters_position'])
         player.is_eliminated = player_data['is_eliminated']
         
-        # Clear existing armies
-        player.armies = []
-        
         # Create armies
-        for army_data in player_data['armies']:
-            army = Army(
+        player.armies = [
+            Army(
                 x=army_data['x'],
                 y=army_data['y'],
                 strength=army_data['strength'],
                 food=army_data['food'],
                 has_general=army_data['has_general'],
-                player_id=player.id
+                player_id=player.id,
+                flags=(MOVED if army_data['moved_this_turn'] else 0) |
+                      (FOUGHT if army_data['fought_this_turn'] else 0)
             )
-            army.moved_this_turn = army_data['moved_this_turn']
-            army.fought_this_turn = army_data['fought_this_turn']
-            
-            player.armies.append(army)
+            for army_data in player_data['armies']
+        ]
+        for army in player.armies:
             board.add_army(army)
+            
+    # Eliminated players are skipped in turn order
+    game_state._rebuild_active_order()
+    
+    # Combat was resolved before the game was saved; don't fight it again
+    board.combat_dirty = False
     
     # Set winner if applicable
     winner_id = data.get('winner')